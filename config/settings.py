@@ -99,6 +99,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse the connection across requests instead of reconnecting each time.
+        # On PostgreSQL switch to Django's built-in pool: 'OPTIONS': {'pool': True}
+        # (psycopg[pool]; requires CONN_MAX_AGE = 0) or put pgbouncer in front.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+
+# Filter options, paginator counts and filter summaries are cached here and
+# invalidated by the signal handlers in web/apps.py. LocMemCache is per
+# process, so with several gunicorn workers other workers only see a write
+# once their entries expire – in production point every worker at one shared
+# cache: 'django.core.cache.backends.redis.RedisCache' (needs the redis package).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'uni-list',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
     }
 }
 
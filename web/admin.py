@@ -8,19 +8,61 @@ import nested_admin
 
 from web.models import University, Direction, Degree, TuitionFee, Gallery, InstitutionCategory, Location, Category, EducationType, EducationLanguage
 
-class TuitionFeeInline(nested_admin.NestedStackedInline):
+class CachedChoicesMixin:
+    """
+    Evaluate lookup-table dropdown choices once per request instead of once
+    per inline form – nested inlines otherwise re-query every lookup table
+    for each direction and tuition fee on the page.
+    """
+
+    cached_choice_models = (InstitutionCategory, Location, Category, EducationType, EducationLanguage, Degree)
+
+    def _cache_choices(self, db_field, request, formfield):
+        if formfield is None or request is None:
+            return formfield
+        if db_field.related_model not in self.cached_choice_models:
+            return formfield
+        cache = request.__dict__.setdefault("_admin_choices_cache", {})
+        key = (db_field.model, db_field.name)
+        if key not in cache:
+            cache[key] = list(iter(formfield.choices))    # iter(): skip the COUNT(*) len() would run
+        formfield.choices = cache[key]
+        return formfield
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        return self._cache_choices(db_field, request, formfield)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_manytomany(db_field, request, **kwargs)
+        return self._cache_choices(db_field, request, formfield)
+
+
+class TuitionFeeInline(CachedChoicesMixin, nested_admin.NestedStackedInline):
     extra = 0
     model = TuitionFee
 
-class DirectionInline(nested_admin.NestedStackedInline):
+    def get_queryset(self, request):
+        # inline headers render TuitionFee.__str__ (direction → university, education type)
+        return super().get_queryset(request).select_related("direction__university", "education_type")
+
+class DirectionInline(CachedChoicesMixin, nested_admin.NestedStackedInline):
     extra = 0
     model = Direction
     inlines = [TuitionFeeInline]
 
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request)
+            .select_related("university", "category")
+            .prefetch_related("education_types", "education_languages", "degrees")
+        )
+
 
-class DirectionAdmin(nested_admin.NestedModelAdmin):
+class DirectionAdmin(CachedChoicesMixin, nested_admin.NestedModelAdmin):
     extra = 0
     inlines = [TuitionFeeInline]
+    list_select_related = ("university",)   # Direction.__str__ uses university.full_name
 
 
 class GalleryInline(nested_admin.NestedStackedInline):
@@ -28,7 +70,7 @@ class GalleryInline(nested_admin.NestedStackedInline):
     model = Gallery
 
 
-class UniversityAdmin(nested_admin.NestedModelAdmin):
+class UniversityAdmin(CachedChoicesMixin, nested_admin.NestedModelAdmin):
     extra = 0
     inlines = [DirectionInline, GalleryInline]
 
@@ -51,7 +93,34 @@ def fetch_data_view(request):
 
 
 # Custom AdminSite to add our custom view
+# Static "Data Management" entry appended to the admin index
+FETCH_DATA_APP = {
+    'name': 'Data Management',
+    'app_label': 'data_management',
+    'app_url': '',
+    'has_module_perms': True,
+    'models': [{
+        'name': 'Fetch Data',
+        'object_name': 'FetchData',
+        'admin_url': '/admin/fetch-data/',
+        'add_url': None,
+        'view_only': True,
+    }]
+}
+
 class CustomAdminSite(admin.AdminSite):
+    def get_app_list(self, request, app_label=None):
+        """
+        Build the full app list once per request – each_context() (sidebar)
+        and index() both ask for it, and every call re-checks the model
+        permissions of all registered admins.
+        """
+        if app_label is not None:
+            return super().get_app_list(request, app_label)
+        if "_admin_app_list" not in request.__dict__:
+            request.__dict__["_admin_app_list"] = super().get_app_list(request)
+        return request.__dict__["_admin_app_list"]
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -64,24 +133,8 @@ class CustomAdminSite(admin.AdminSite):
         Display the main admin index page, which lists all of the installed
         apps that have been registered in this site.
         """
-        app_list = self.get_app_list(request)
-        
-        # Add our custom fetch data section
-        fetch_data_app = {
-            'name': 'Data Management',
-            'app_label': 'data_management',
-            'app_url': '',
-            'has_module_perms': True,
-            'models': [{
-                'name': 'Fetch Data',
-                'object_name': 'FetchData',
-                'admin_url': '/admin/fetch-data/',
-                'add_url': None,
-                'view_only': True,
-            }]
-        }
-        
-        app_list.append(fetch_data_app)
+        # copy – the per-request app list is shared with each_context()
+        app_list = [*self.get_app_list(request), FETCH_DATA_APP]
         
         context = {
             **self.each_context(request),
@@ -101,22 +154,18 @@ admin_site = CustomAdminSite(name='admin')
 
 
 # Register your models here.
-admin_site.register(University, UniversityAdmin)
-admin_site.register(Direction, DirectionAdmin)
-admin_site.register(InstitutionCategory)
-admin_site.register(Location)
-admin_site.register(Category)
-admin_site.register(EducationType)
-admin_site.register(EducationLanguage)
-admin_site.register(Degree)
+MODEL_ADMINS = [
+    (University, UniversityAdmin),
+    (Direction, DirectionAdmin),
+    (InstitutionCategory, None),
+    (Location, None),
+    (Category, None),
+    (EducationType, None),
+    (EducationLanguage, None),
+    (Degree, None),
+]
 
 # Also register with default admin site for backward compatibility
-admin.site.register(University, UniversityAdmin)
-admin.site.register(Direction, DirectionAdmin)
-admin.site.register(InstitutionCategory)
-admin.site.register(Location)
-admin.site.register(Category)
-admin.site.register(EducationType)
-admin.site.register(EducationLanguage)
-admin.site.register(Degree)
-
+for site in (admin_site, admin.site):
+    for model, model_admin in MODEL_ADMINS:
+        site.register(model, model_admin)
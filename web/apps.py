@@ -1,6 +1,57 @@
+import time
+
 from django.apps import AppConfig
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+# Models the caches read → the cached filter-option sets they feed (any of
+# their writes also clears the home stats and orphans the cached list counts)
+FILTER_OPTION_MODELS = {
+    'InstitutionCategory': ('universities',),
+    'Location': ('universities',),
+    'EducationType': ('universities',),
+    'EducationLanguage': ('universities',),
+    'Degree': ('universities',),
+    'Category': ('directions',),
+    'University': ('universities', 'directions'),
+    'Direction': ('directions',),
+}
+
+
+def _clear_filter_options(sender, **kwargs):
+    from .views import (
+        COUNT_CACHE_VERSION_KEY, FILTER_OPTIONS_CACHE_KEYS, FILTER_OPTIONS_RESPONSE_CACHE_KEY,
+        FILTER_OPTIONS_TYPES, HOME_STATS_CACHE_KEY, PRICE_BOUNDS_CACHE_KEY,
+    )
+    # M2M through models feed no option set – only the counts below
+    kinds = FILTER_OPTION_MODELS.get(sender.__name__, ())
+    stale = [HOME_STATS_CACHE_KEY, *(FILTER_OPTIONS_CACHE_KEYS[kind] for kind in kinds)]
+    if kinds:
+        # every assembled filter_options_api payload embeds one of the sets
+        stale += [FILTER_OPTIONS_RESPONSE_CACHE_KEY.format(t) for t in FILTER_OPTIONS_TYPES]
+    if sender.__name__ == 'University':
+        stale.append(PRICE_BOUNDS_CACHE_KEY)
+    cache.delete_many(stale)
+    # new version → every cached paginator count is orphaned (and expires)
+    cache.set(COUNT_CACHE_VERSION_KEY, time.time_ns(), None)
 
 
 class WebConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'web'
+
+    def ready(self):
+        for model_name in FILTER_OPTION_MODELS:
+            model = self.get_model(model_name)
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    _clear_filter_options, sender=model,
+                    dispatch_uid=f'clear_filter_options_{signal is post_save}_{model_name}',
+                )
+        # M2M edits change which rows the education type/language/degree filters match
+        for model_name in ('University', 'Direction'):
+            for field in self.get_model(model_name)._meta.many_to_many:
+                m2m_changed.connect(
+                    _clear_filter_options, sender=field.remote_field.through,
+                    dispatch_uid=f'clear_filter_options_m2m_{model_name}_{field.name}',
+                )
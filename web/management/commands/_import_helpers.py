@@ -6,30 +6,84 @@ Nothing here touches the database schema, so the file can be re‑used by tests.
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation
+from itertools import islice
 from pathlib import Path
 from urllib.parse import quote, urljoin
-from urllib.request import urlopen
 
+import ijson
+import urllib3
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.utils.text import slugify
 
+from web.apps import _clear_filter_options
 from web.models import (
+    CachedLookupMixin,
     Location,
     University,
     Gallery,
+    set_image_dimensions,
 )
 
 MENTALABA_CDN = "https://api.mentalaba.uz/"
 IMAGE_EXT     = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+BATCH_SIZE    = 1000
+DOWNLOAD_CONCURRENCY = 32
+COORD_PLACES  = Decimal("0.000001")           # matches University.latitude/longitude
+
+# one keep-alive pool per host for the whole import (shared by all workers)
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=DOWNLOAD_CONCURRENCY,
+    block=True,
+    retries=urllib3.Retry(total=3, backoff_factor=0.2),
+)
 
 
 # ───────────────────────── basic utils ──────────────────────────
 def _bool(v) -> bool:
-    return v if isinstance(v, bool) else str(v).lower() == "true"
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, int):
+        return v != 0
+    return str(v).lower() == "true"
+
+
+def _iter_json(path: Path):
+    """Stream the items of a top‑level JSON array instead of loading the whole file."""
+    with path.open("rb") as fp:
+        yield from ijson.items(fp, "item", use_float=True)
+
+
+def _chunks(iterable, size: int = BATCH_SIZE):
+    """Yield lists of at most *size* items."""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _int(v):
+    """JSON ids arrive as int or str – normalise for dict lookups."""
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return v
+
+
+def _coord(v) -> Decimal | None:
+    """Latitude/longitude (str, float or blank) → Decimal with 6 places, or None."""
+    if v in (None, ""):
+        return None
+    try:
+        return Decimal(str(v).strip()).quantize(COORD_PLACES)
+    except (InvalidOperation, ValueError):
+        return None
 
 
 def _url_encode(path: str, cdn: str = MENTALABA_CDN) -> str:
-    """Make any incoming URL or relative CDN‑path safe for urlopen()."""
+    """Make any incoming URL or relative CDN‑path safe to request."""
     if not path:
         return ""
     cleaned = path.replace("\xa0", " ").strip().lstrip("/")
@@ -41,16 +95,32 @@ def _url_encode(path: str, cdn: str = MENTALABA_CDN) -> str:
 
 def _download_file(url: str) -> bytes | None:
     try:
-        with urlopen(url) as resp:
-            return resp.read()
+        resp = _POOL.request("GET", url, timeout=10.0)
     except Exception:
         return None
+    return resp.data if resp.status == 200 else None
+
+
+def _store_remote_file(instance, field_name: str, raw_path: str) -> bool:
+    """
+    Download *raw_path* and write it to storage on **instance.field_name**
+    (``save=False`` – no DB access, so it is safe to run in a worker thread).
+    """
+    data = _download_file(_url_encode(raw_path))
+    if not data:
+        return False
+    filename = os.path.basename(raw_path)
+    getattr(instance, field_name).save(filename, ContentFile(data), save=False)
+    if field_name in getattr(instance, "IMAGE_DIMENSIONS", {}):   # fill width/height now
+        set_image_dimensions(instance, field_name, ContentFile(data))
+    return True
 
 
-def _attach_remote_file(instance, field_name: str, raw_path: str) -> None:
+def _queue_remote_file(pending: list, instance, field_name: str, raw_path: str) -> None:
     """
-    Download *raw_path* and save it into **instance.field_name**,
+    Record a download of *raw_path* into **instance.field_name**,
     BUT **only** when the FileField is still empty.
+    Nothing is fetched here – _attach_pending_files() handles the whole queue.
     """
     if not raw_path:
         return
@@ -59,27 +129,135 @@ def _attach_remote_file(instance, field_name: str, raw_path: str) -> None:
     if file_field and file_field.name:          # already has something
         return
 
-    url  = _url_encode(raw_path)
-    data = _download_file(url)
-    if data:
-        filename = os.path.basename(raw_path)
-        file_field.save(filename, ContentFile(data), save=False)
+    pending.append((instance, field_name, raw_path))
+
+
+def _file_columns(model, field_name: str) -> list[str]:
+    """The file column plus the width/height columns set_image_dimensions() fills in."""
+    return [field_name, *getattr(model, "IMAGE_DIMENSIONS", {}).get(field_name, ())]
+
+
+def _attach_pending_files(pending: list) -> None:
+    """
+    Download + store every queued file on a thread pool (at most
+    DOWNLOAD_CONCURRENCY in flight), then persist the new file names with
+    one bulk_update per (model, field) from the main thread.
+    Unsaved instances only get their file set – the caller bulk_creates them.
+    """
+    touched: dict[tuple[type, str], list] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(_store_remote_file, instance, field_name, raw_path): (instance, field_name)
+                for instance, field_name, raw_path in pending
+            }
+            for future in as_completed(futures):
+                instance, field_name = futures[future]
+                if future.result() and instance.pk is not None:
+                    touched.setdefault((type(instance), field_name), []).append(instance)
+    finally:
+        _POOL.clear()                               # drop the keep-alive sockets
+
+    for (model, field_name), objs in touched.items():
+        model.objects.bulk_update(objs, _file_columns(model, field_name), batch_size=BATCH_SIZE)
 
 
 # ───────────────────────── model helpers ─────────────────────────
-def _get_location(name: str) -> Location | None:
+def _defer_constraints() -> None:
+    """
+    Postgres only: postpone deferrable constraint checks (Django's FKs are
+    created DEFERRABLE) until COMMIT, so bulk writes aren't validated row by
+    row. Must run inside the importer's transaction.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cur:
+            cur.execute("SET CONSTRAINTS ALL DEFERRED")
+
+
+def _clear_caches(*models) -> None:
+    """
+    Run the cache invalidation the post_save/post_delete/m2m_changed handlers
+    would have done for *models* – bulk_create, fast_update and the raw
+    through-table writes send no signals. With the default (per-process)
+    LocMemCache this only reaches this command's process; the web workers
+    see the import once their entries expire unless CACHES points at a
+    shared backend such as Redis.
+    """
+    for model in models:
+        if issubclass(model, CachedLookupMixin):
+            model.clear_cache()
+        _clear_filter_options(model)
+
+
+def _lookup_table(model) -> tuple[dict, dict]:
+    """Load a small lookup table once → ``(by_id, by_name)`` dicts."""
+    by_id, by_name = {}, {}
+    for obj in model.objects.all():
+        by_id[obj.id] = obj
+        by_name[obj.name] = obj
+    return by_id, by_name
+
+
+def _resolve_many(by_id: dict, by_name: dict, items, id_key: str, name_keys) -> list:
+    """
+    Map JSON items onto lookup objects: try each of *name_keys* first,
+    then fall back to *id_key*. Unknown items are dropped.
+    """
+    found = []
+    if not isinstance(items, list):
+        return found
+    for itm in items:
+        obj = None
+        for nk in name_keys:
+            if itm.get(nk):
+                obj = by_name.get(itm[nk])
+                if obj:
+                    break
+        if not obj and itm.get(id_key):
+            obj = by_id.get(_int(itm[id_key]))
+        if obj:
+            found.append(obj)
+    return found
+
+
+def _replace_m2m(model, field_name: str, owner_ids, pairs) -> None:
+    """
+    Bulk equivalent of ``obj.<field_name>.set(...)`` for many owners at once:
+    one DELETE for *owner_ids*, then batched INSERTs of the
+    ``(owner_id, target_id)`` *pairs* straight into the through table.
+    """
+    field    = model._meta.get_field(field_name)
+    through  = field.remote_field.through
+    src, dst = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+
+    through.objects.filter(**{f"{src}__in": owner_ids}).delete()
+    through.objects.bulk_create(
+        [through(**{src: owner_id, dst: target_id}) for owner_id, target_id in pairs],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def _get_location(loc_by_name: dict[str, Location], name: str) -> Location | None:
+    """Resolve *name* against the preloaded ``{name: Location}`` table."""
     if not name:
         return None
-    try:
-        return Location.objects.get(name=name.strip())
-    except Location.DoesNotExist:
-        return None
+    return loc_by_name.get(name.strip())
 
 
-def _add_gallery_item(university: University, raw: str) -> None:
+def _add_gallery_item(
+    university: University,
+    raw: str,
+    existing_links: set[str],
+    existing_images: set[str],
+    new_rows: list,
+    pending: list,
+) -> None:
     """
     Add **one** gallery entry (image or external link) but never duplicate.
-    Called only by the university import routine.
+    Duplicates are checked against the prefetched *existing_links* /
+    *existing_images* (basenames) sets; the unsaved row goes to *new_rows*
+    for a later bulk_create and the image download is queued on *pending*.
     """
     raw = (raw or "").strip()
     if not raw:
@@ -89,15 +267,17 @@ def _add_gallery_item(university: University, raw: str) -> None:
 
     if is_link:
         # simple URL gallery item
-        if not university.gallery_items.filter(link=raw).exists():
-            Gallery.objects.create(university=university, link=raw)
+        if raw not in existing_links:
+            existing_links.add(raw)
+            new_rows.append(Gallery(university=university, link=raw))
         return
 
     # remote image
     filename = os.path.basename(raw)
-    if university.gallery_items.filter(image__endswith=filename).exists():
+    if filename in existing_images:
         return
 
-    gal = Gallery.objects.create(university=university)
-    _attach_remote_file(gal, "image", raw)
-    gal.save()
+    existing_images.add(filename)
+    gal = Gallery(university=university)
+    new_rows.append(gal)
+    _queue_remote_file(pending, gal, "image", raw)
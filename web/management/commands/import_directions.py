@@ -1,11 +1,10 @@
 # myapp/management/commands/import_directions.py
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.utils.text import slugify
 
 from web.models import (
@@ -16,9 +15,38 @@ from web.models import (
     EducationLanguage,
     Degree,
     TuitionFee,
+    refresh_m2m_bits,
 )
 
-from ._import_helpers import _bool
+from ._import_helpers import (
+    BATCH_SIZE,
+    _bool,
+    _chunks,
+    _clear_caches,
+    _defer_constraints,
+    _int,
+    _iter_json,
+    _lookup_table,
+    _replace_m2m,
+    _resolve_many,
+)
+
+# every column written by the importer (bulk_update needs them spelled out)
+DIRECTION_FIELDS = [
+    "direction_name",
+    "direction_slug",
+    "direction_description",
+    "requirement",
+    "first_subject",
+    "second_subject",
+    "has_mandatory_subjects",
+    "has_stipend",
+    "is_open_for_admission",
+    "application_start_date",
+    "application_deadline",
+    "is_promoted",
+    "category",
+]
 
 class Command(BaseCommand):
     """Create / update directions using *university_id* straight from JSON."""
@@ -28,15 +56,55 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("directions_json", help="Path to directions.json")
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         d_path = Path(opts["directions_json"]).resolve()
         if not d_path.exists():
             raise CommandError("directions_json not found")
 
-        directions = json.loads(d_path.read_text(encoding="utf‑8"))
+        # lookup tables are tiny → load once, resolve from memory
+        self.cat_by_id, _                = _lookup_table(Category)
+        self.et_by_id, self.et_by_name   = _lookup_table(EducationType)
+        self.el_by_id, self.el_by_name   = _lookup_table(EducationLanguage)
+        self.deg_by_id, self.deg_by_name = _lookup_table(Degree)
+        self.slug_cache: dict[tuple[str, str], str] = {}
 
         created = updated = skipped = 0
+        failed = []                                 # (batch no., error)
+
+        # stream the file; every BATCH_SIZE rows commit on their own
+        for no, batch in enumerate(_chunks(_iter_json(d_path)), 1):
+            try:
+                with transaction.atomic():
+                    _defer_constraints()
+                    c, u, s = self._import_batch(batch)
+            except DatabaseError as exc:
+                failed.append((no, exc))
+                continue
+            created, updated, skipped = created + c, updated + u, skipped + s
+        _clear_caches(Direction)
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"Directions – created: {created}, updated: {updated}, skipped (missing university): {skipped}"))
+        for no, exc in failed:
+            self.stderr.write(self.style.ERROR(f"Batch {no} rolled back: {exc}"))
+
+    def _slug(self, uni_slug: str, dir_name: str) -> str:
+        """``slugify`` is costly – compute each (university, name) slug once."""
+        key = (uni_slug, dir_name)
+        if key not in self.slug_cache:
+            self.slug_cache[key] = slugify(f"{uni_slug}-{dir_name}")
+        return self.slug_cache[key]
+
+    def _import_batch(self, directions):
+        """Import one chunk of JSON rows; returns ``(created, updated, skipped)``."""
+        # ─────────── pass 1: collect rows keyed by (university, name) ───────────
+        wanted: dict[tuple[int, str], tuple[dict, dict]] = {}
+        skipped = 0
+
+        # every university of the batch in one query
+        unis_by_id = University.objects.in_bulk(
+            {_int(d["university_id"]) for d in directions if d.get("university_id")}
+        )
 
         for d in directions:
             uni_id = d.get("university_id")
@@ -44,20 +112,17 @@ class Command(BaseCommand):
                 skipped += 1
                 continue
 
-            try:
-                uni = University.objects.get(id=uni_id)
-            except University.DoesNotExist:
+            uni = unis_by_id.get(_int(uni_id))
+            if uni is None:
                 # University not in DB yet → skip for now
                 print(f"University {uni_id} {d} not found")
                 skipped += 1
                 continue
 
             dir_name = d.get("direction_name_uz") or d.get("direction_name_ru") or "Unnamed"
-            dir_slug = d.get("direction_slug") or slugify(f"{uni.slug}-{dir_name}")
+            dir_slug = d.get("direction_slug") or self._slug(uni.slug, dir_name)
 
-            category = None
-            if d.get("category_id"):
-                category = Category.objects.filter(id=d["category_id"]).first()
+            category = self.cat_by_id.get(_int(d.get("category_id")))
 
             dir_defaults = {
                 "direction_name": dir_name,
@@ -71,86 +136,100 @@ class Command(BaseCommand):
                 "is_open_for_admission": _bool(d.get("is_open_for_admission")),
                 "application_start_date": d.get("application_start_date"),
                 "application_deadline": d.get("application_deadline"),
-                "status": d.get("status") or "active",
                 "is_promoted": d.get("is_promoted") or 0,
                 "category": category,
             }
-
-            dir_obj, created_flag = Direction.objects.update_or_create(
-                direction_name=dir_name,
-                university=uni,
-                defaults=dir_defaults,
+            wanted[(uni.id, dir_name)] = (d, dir_defaults)
+
+        # ─────────── pass 2: diff against the DB, write in bulk ───────────
+        existing = {
+            (obj.university_id, obj.direction_name): obj
+            for obj in Direction.objects.select_related(None).filter(
+                university_id__in={uni_id for uni_id, _ in wanted},
+                direction_name__in={name for _, name in wanted},
             )
-            created += int(created_flag)
-            updated += int(not created_flag)
-
-            # ─────────── Many‑to‑many helpers ───────────
-            def _resolve_many(model_cls, items, id_key, *name_keys):
-                found = []
-                if not isinstance(items, list):
-                    return found
-                for itm in items:
-                    obj = None
-                    for nk in name_keys:
-                        if itm.get(nk):
-                            obj = model_cls.objects.filter(name=itm[nk]).first()
-                            if obj:
-                                break
-                    if not obj and itm.get(id_key):
-                        obj = model_cls.objects.filter(id=itm[id_key]).first()
-                    if obj:
-                        found.append(obj)
-                return found
-
-            dir_obj.education_types.set(
-                _resolve_many(
-                    EducationType,
+        }
+
+        to_create, to_update = [], []
+        rows = []                                   # (dir_obj, json_row)
+        for (uni_id, dir_name), (d, dir_defaults) in wanted.items():
+            dir_obj = existing.get((uni_id, dir_name))
+            if dir_obj is None:
+                dir_obj = Direction(university_id=uni_id, **dir_defaults)
+                to_create.append(dir_obj)
+            else:
+                for field, value in dir_defaults.items():
+                    setattr(dir_obj, field, value)
+                to_update.append(dir_obj)
+            rows.append((dir_obj, d))
+
+        Direction.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        Direction.objects.fast_update(to_update, DIRECTION_FIELDS)
+        created, updated = len(to_create), len(to_update)
+
+        # ─────────── pass 3: relations of the saved rows ───────────
+        education_types, education_languages, degrees = [], [], []
+        pending_fees: dict[tuple[int, int], TuitionFee] = {}   # last one per combo wins
+
+        for dir_obj, d in rows:
+            education_types += [
+                (dir_obj.pk, obj.pk) for obj in _resolve_many(
+                    self.et_by_id, self.et_by_name,
                     d.get("education_types", []),
                     "education_type_id",
-                    "education_type_name_uz", "education_type_name_ru", "education_type_name_en",
+                    ("education_type_name_uz", "education_type_name_ru", "education_type_name_en"),
                 )
-            )
-            dir_obj.education_languages.set(
-                _resolve_many(
-                    EducationLanguage,
+            ]
+            education_languages += [
+                (dir_obj.pk, obj.pk) for obj in _resolve_many(
+                    self.el_by_id, self.el_by_name,
                     d.get("education_languages", []),
                     "education_language_id",
-                    "education_language_name_uz", "education_language_name_ru", "education_language_name_en",
+                    ("education_language_name_uz", "education_language_name_ru", "education_language_name_en"),
                 )
-            )
-            dir_obj.degrees.set(
-                _resolve_many(
-                    Degree,
+            ]
+            degrees += [
+                (dir_obj.pk, obj.pk) for obj in _resolve_many(
+                    self.deg_by_id, self.deg_by_name,
                     d.get("degrees", []),
                     "degree_id",
-                    "degree_name_uz", "degree_name_ru", "degree_name_en",
+                    ("degree_name_uz", "degree_name_ru", "degree_name_en"),
                 )
-            )
+            ]
 
             # tuition fees
             for fee in d.get("tuition_fees", []):
-                et = None
                 et_name = (
                     fee.get("education_type_name_uz")
                     or fee.get("education_type_name_ru")
                     or fee.get("education_type_name_en")
                 )
-                if et_name:
-                    et = EducationType.objects.filter(name=et_name).first()
-                if not et and fee.get("education_type_id"):
-                    et = EducationType.objects.filter(id=fee["education_type_id"]).first()
+                et = self.et_by_name.get(et_name) or self.et_by_id.get(_int(fee.get("education_type_id")))
                 if not et:
                     continue
 
-                TuitionFee.objects.update_or_create(
+                pending_fees[(dir_obj.pk, et.pk)] = TuitionFee(
                     direction=dir_obj,
                     education_type=et,
-                    defaults={
-                        "academic_year": fee.get("academic_year"),
-                        "local_tuition_fee": fee.get("local_tuition_fee"),
-                        "international_tuition_fee": fee.get("international_tuition_fee"),
-                    },
+                    academic_year=fee.get("academic_year"),
+                    local_tuition_fee=fee.get("local_tuition_fee"),
+                    international_tuition_fee=fee.get("international_tuition_fee"),
                 )
 
-        self.stdout.write("")
-        self.stdout.write(self.style.SUCCESS(f"Directions – created: {created}, updated: {updated}, skipped (missing university): {skipped}"))
+        touched = [dir_obj.pk for dir_obj, _ in rows]
+        _replace_m2m(Direction, "education_types", touched, education_types)
+        _replace_m2m(Direction, "education_languages", touched, education_languages)
+        _replace_m2m(Direction, "degrees", touched, degrees)
+        for field in Direction.M2M_BITS:
+            refresh_m2m_bits(Direction, field, touched)
+
+        # one upsert for every fee (unique on direction + education_type)
+        TuitionFee.objects.bulk_create(
+            list(pending_fees.values()),
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["direction", "education_type"],
+            update_fields=["academic_year", "local_tuition_fee", "international_tuition_fee"],
+        )
+
+        return created, updated, skipped
@@ -1,7 +1,7 @@
 # <your_app>/management/commands/import_filters.py
-import json
 from pathlib import Path
 
+import ijson
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
@@ -14,6 +14,8 @@ from web.models import (  # adjust the import path to your project
     Degree
 )
 
+from ._import_helpers import _clear_caches, _iter_json
+
 # -- Helpers ---------------------------------------------------------------
 
 MODEL_MAP = {
@@ -29,28 +31,28 @@ MODEL_MAP = {
 def _upsert_objects(model, records):
     """
     Create new rows or update existing ones, preserving IDs from the filters.json file.
+    Rows with an ID are merged in one INSERT ... ON CONFLICT (id) DO UPDATE;
+    ID-less rows are inserted by (unique) name, skipping names that exist.
     """
-    for rec in records:
-        name = rec["name"].strip()
-        id_value = rec.get("id")
-        
-        if id_value:
-            # Try to find by ID first
-            try:
-                obj = model.objects.filter(id=id_value).first()
-                if obj:
-                    # If object exists with this ID, update its name
-                    if obj.name != name:
-                        obj.name = name
-                        obj.save()
-                else:
-                    # Create new object with specified ID
-                    obj = model.objects.create(id=id_value, name=name)
-            except Exception as e:
-                print(f"Error processing {name} with ID {id_value}: {e}")
-        else:
-            # Fallback to get_or_create by name if no ID provided
-            obj, created = model.objects.get_or_create(name=name)
+    instances = [
+        model(id=int(rec["id"]), name=rec["name"].strip())
+        for rec in records
+        if rec.get("id")
+    ]
+    model.objects.bulk_create(
+        instances,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["name"],
+    )
+
+    # Fallback to insert-by-name if no ID provided
+    model.objects.bulk_create(
+        [model(name=rec["name"].strip()) for rec in records if not rec.get("id")],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
 
 
 # -- Management command ----------------------------------------------------
@@ -75,12 +77,12 @@ class Command(BaseCommand):
             raise CommandError(f"File not found: {json_path}")
 
         try:
-            with json_path.open(encoding="utf-8") as fp:
-                data = json.load(fp)
-        except (OSError, json.JSONDecodeError) as exc:
+            data = list(_iter_json(json_path))
+        except (OSError, ijson.JSONError) as exc:
             raise CommandError(f"Could not read JSON – {exc}")
 
         created, updated, skipped = 0, 0, 0
+        synced = []
 
         for item in data:
             name_key = item.get("name")
@@ -89,11 +91,15 @@ class Command(BaseCommand):
             # Only process filters that map to one of our lookup tables
             if model and isinstance(item.get("value"), list):
                 _upsert_objects(model, item["value"])
+                synced.append(model)
                 self.stdout.write(self.style.SUCCESS(f"✔  Synced {model.__name__}"))
                 created += 1
             else:
                 skipped += 1
 
+        # the whole import is one transaction – invalidate once it is visible
+        transaction.on_commit(lambda: _clear_caches(*synced))
+
         self.stdout.write("")  # blank line
         self.stdout.write(self.style.SUCCESS(f"Completed. "
                                              f"Processed: {created}, Skipped: {skipped}"))
@@ -1,28 +1,71 @@
 # myapp/management/commands/import_universities.py
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.utils.text import slugify
 
 from web.models import (
     University,
+    Gallery,
+    Location,
     InstitutionCategory,
     EducationType,
     EducationLanguage,
     Degree,
+    refresh_m2m_bits,
 )
 
 from ._import_helpers import (
+    BATCH_SIZE,
     _bool,
+    _chunks,
+    _coord,
+    _defer_constraints,
+    _int,
+    _iter_json,
     _get_location,
-    _attach_remote_file,
+    _queue_remote_file,
+    _attach_pending_files,
     _add_gallery_item,
+    _clear_caches,
+    _lookup_table,
+    _replace_m2m,
+    _resolve_many,
 )
 
+NAME_KEYS = ("name_uz", "name_ru", "name_en", "name")
+
+# every column written by the importer (bulk_update needs them spelled out)
+UNIVERSITY_FIELDS = [
+    "full_name",
+    "slug",
+    "description",
+    "about_grant",
+    "address",
+    "has_accomodation",
+    "has_grant",
+    "admission_phone",
+    "web_site",
+    "instagram_username",
+    "telegram_username",
+    "facebook_username",
+    "youtube_username",
+    "support_email",
+    "admission_start_date",
+    "admission_deadline",
+    "minimal_tuition_fee",
+    "maximal_tuition_fee",
+    "latitude",
+    "longitude",
+    "is_open_for_admission",
+    "institution_category",
+    "location",
+]
+
 class Command(BaseCommand):
     """
     Import (create or update) universities, including:
@@ -38,36 +81,66 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("universities_json", help="Path to universities.json")
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         u_path = Path(opts["universities_json"]).resolve()
         if not u_path.exists():
             raise CommandError("universities_json file not found")
 
-        universities = json.loads(u_path.read_text(encoding="utf‑8"))
+        # lookup tables are tiny → load once, resolve from memory
+        self.cat_by_id, _                = _lookup_table(InstitutionCategory)
+        _, self.loc_by_name              = _lookup_table(Location)
+        self.et_by_id, self.et_by_name   = _lookup_table(EducationType)
+        self.el_by_id, self.el_by_name   = _lookup_table(EducationLanguage)
+        self.deg_by_id, self.deg_by_name = _lookup_table(Degree)
 
         created = updated = 0
+        pending = []                                # queued (instance, field, path) downloads
+        new_gallery = []                            # unsaved Gallery rows
+        failed = []                                 # (batch no., error)
+
+        # stream the file; every BATCH_SIZE rows commit on their own
+        for no, batch in enumerate(_chunks(_iter_json(u_path)), 1):
+            batch_pending, batch_gallery = [], []
+            try:
+                with transaction.atomic():
+                    _defer_constraints()
+                    c, u = self._import_batch(batch, batch_pending, batch_gallery)
+            except DatabaseError as exc:
+                failed.append((no, exc))
+                continue
+            created, updated = created + c, updated + u
+            pending += batch_pending
+            new_gallery += batch_gallery
+
+        # all remote files in one concurrent batch
+        _attach_pending_files(pending)
+        with transaction.atomic():
+            Gallery.objects.bulk_create(new_gallery, batch_size=BATCH_SIZE)
+        _clear_caches(University)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Universities – created: {created}, updated: {updated}")
+        )
+        for no, exc in failed:
+            self.stderr.write(self.style.ERROR(f"Batch {no} rolled back: {exc}"))
+
+    def _import_batch(self, universities, pending, new_gallery):
+        """Import one chunk of JSON rows; returns ``(created, updated)``."""
+        # ─────────── pass 1: collect rows keyed by full_name ───────────
+        wanted: dict[str, tuple[dict, dict]] = {}
 
         for u in universities:
             uni_name = u.get("full_name_uz") or u.get("full_name_ru") or u.get("full_name_en")
             uni_slug = u.get("slug") or slugify(uni_name)
 
-            inst_cat = None
-            if u.get("institution_category_id"):
-                inst_cat = (
-                    InstitutionCategory.objects.filter(id=u["institution_category_id"]).first()
-                )
+            inst_cat = self.cat_by_id.get(_int(u.get("institution_category_id")))
 
             uni_defaults = {
-                "id": u.get("id"),
                 "full_name": uni_name,
                 "slug": uni_slug,
                 "description": u.get("description_uz") or "",
                 "about_grant": u.get("about_grant_uz") or "",
                 "address": u.get("address_uz") or "",
-                "founded_year": u.get("founded_year"),
-                "students_count": u.get("students_count"),
-                "current_quota": u.get("current_quota"),
                 "has_accomodation": _bool(u.get("has_accomodation")),
                 "has_grant": _bool(u.get("has_grant")),
                 "admission_phone": u.get("admission_phone"),
@@ -81,67 +154,86 @@ class Command(BaseCommand):
                 "admission_deadline": u.get("admission_deadline"),
                 "minimal_tuition_fee": u.get("minimal_tuition_fee"),
                 "maximal_tuition_fee": u.get("maximal_tuition_fee"),
-                "latitude": u.get("latitude"),
-                "longitude": u.get("longitude"),
+                "latitude": _coord(u.get("latitude")),
+                "longitude": _coord(u.get("longitude")),
                 "is_open_for_admission": _bool(u.get("is_open_for_admission")),
                 "institution_category": inst_cat,
-                "location": _get_location(u.get("location_uz", "")),
+                "location": _get_location(self.loc_by_name, u.get("location_uz") or ""),
             }
-
-            uni, created_flag = University.objects.update_or_create(
-                full_name=uni_name,
-                defaults=uni_defaults,
-            )
-            created += int(created_flag)
-            updated += int(not created_flag)
-
+            wanted[uni_name] = (u, uni_defaults)
+
+        # ─────────── pass 2: diff against the DB, write in bulk ───────────
+        existing = {
+            uni.full_name: uni
+            for uni in University.objects.filter(full_name__in=list(wanted))
+        }
+
+        to_create, to_update = [], []
+        rows = []                                   # (uni, json_row)
+        for uni_name, (u, uni_defaults) in wanted.items():
+            uni = existing.get(uni_name)
+            if uni is None:
+                # new rows keep the Mentalaba id
+                uni = University(id=u.get("id"), **uni_defaults)
+                to_create.append(uni)
+            else:
+                for field, value in uni_defaults.items():
+                    setattr(uni, field, value)
+                to_update.append(uni)
+            rows.append((uni, u))
+
+        University.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        University.objects.fast_update(to_update, UNIVERSITY_FIELDS)
+
+        # ─────────── pass 3: files + relations of the saved rows ───────────
+        m2m_specs = (
+            ("education_type", "education_types", self.et_by_id, self.et_by_name),
+            ("education_language", "education_languages", self.el_by_id, self.el_by_name),
+            ("degree", "degrees", self.deg_by_id, self.deg_by_name),
+        )
+        # existing gallery per university, one query for the whole batch
+        gallery: dict[int, tuple[set[str], set[str]]] = {}
+        for uni_id, link, image in Gallery.objects.filter(
+            university_id__in=[uni.pk for uni, _ in rows]
+        ).values_list("university_id", "link", "image"):
+            links, images = gallery.setdefault(uni_id, (set(), set()))
+            if link:
+                links.add(link)
+            if image:
+                images.add(os.path.basename(image))
+
+        m2m_owners = {field: [] for _, field, _, _ in m2m_specs}
+        m2m_pairs = {field: [] for _, field, _, _ in m2m_specs}
+
+        for uni, u in rows:
             # logo / licence only when blank
-            _attach_remote_file(uni, "logo", u.get("logo"))
+            _queue_remote_file(pending, uni, "logo", u.get("logo"))
             lic = (
                 u.get("accreditation_certificate")
                 or u.get("certification_link")
                 or u.get("license_file")
             )
-            _attach_remote_file(uni, "license_file", lic)
+            _queue_remote_file(pending, uni, "license_file", lic)
 
             # gallery – populate once
-            if not uni.gallery_items.exists() and isinstance(u.get("gallery"), list):
+            links, images = gallery.get(uni.pk, (set(), set()))
+            if not (links or images) and isinstance(u.get("gallery"), list):
                 for g_item in u["gallery"]:
-                    _add_gallery_item(uni, g_item)
-
-            # m2m sync helpers --------------------------------------------------
-            def _resolve_many(model_cls, items, id_key="id", name_keys=None):
-                objs = []
-                if not isinstance(items, list):
-                    return objs
-                name_keys = name_keys or ["name_uz", "name_ru", "name_en", "name"]
-                for itm in items:
-                    obj = None
-                    for nk in name_keys:
-                        if itm.get(nk):
-                            obj = model_cls.objects.filter(name=itm[nk]).first()
-                            if obj:
-                                break
-                    if not obj and itm.get(id_key):
-                        obj = model_cls.objects.filter(id=itm[id_key]).first()
-                    if obj:
-                        objs.append(obj)
-                return objs
-
-            if "education_type" in u:
-                uni.education_types.set(
-                    _resolve_many(EducationType, u["education_type"])
-                )
-            if "education_language" in u:
-                uni.education_languages.set(
-                    _resolve_many(EducationLanguage, u["education_language"])
-                )
-            if "degree" in u:
-                uni.degrees.set(_resolve_many(Degree, u["degree"]))
-
-            uni.save()
-
-        self.stdout.write(
-            self.style.SUCCESS(f"Universities – created: {created}, updated: {updated}")
-        )
- 
\ No newline at end of file
+                    _add_gallery_item(uni, g_item, links, images, new_gallery, pending)
+
+            # M2M pairs – only for rows that actually carry the key
+            for json_key, field, by_id, by_name in m2m_specs:
+                if json_key in u:
+                    m2m_owners[field].append(uni.pk)
+                    m2m_pairs[field] += [
+                        (uni.pk, obj.pk)
+                        for obj in _resolve_many(by_id, by_name, u[json_key], "id", NAME_KEYS)
+                    ]
+
+        for field, owners in m2m_owners.items():
+            if owners:
+                _replace_m2m(University, field, owners, m2m_pairs[field])
+                if field in University.M2M_BITS:
+                    refresh_m2m_bits(University, field, owners)
+
+        return len(to_create), len(to_update)
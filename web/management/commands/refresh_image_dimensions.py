@@ -0,0 +1,53 @@
+# myapp/management/commands/refresh_image_dimensions.py
+from django.core.management.base import BaseCommand
+
+from web.models import Gallery, University, set_image_dimensions
+
+from ._import_helpers import BATCH_SIZE, _chunks
+
+
+class Command(BaseCommand):
+    """
+    Fill the width/height columns of stored logos and gallery images that
+    don't have them yet (rows from before the columns existed). Files that
+    are missing from storage are reported and skipped; non-raster files
+    (SVG) keep NULL dimensions and are re-read on the next run.
+    The command is *idempotent* – safe to rerun any time.
+
+    Example:
+        python manage.py refresh_image_dimensions
+    """
+
+    help = "Backfill logo / gallery image width and height from the stored files."
+
+    def handle(self, *args, **opts):
+        for model in (University, Gallery):
+            for field_name, (width_field, height_field) in model.IMAGE_DIMENSIONS.items():
+                rows = list(
+                    model.objects.filter(**{f"{width_field}__isnull": True})
+                    .exclude(**{f"{field_name}__isnull": True})
+                    .exclude(**{field_name: ""})
+                    .only("pk", field_name)
+                )
+                measured, missing = [], 0
+                for obj in rows:
+                    try:
+                        with getattr(obj, field_name).open("rb") as fp:
+                            set_image_dimensions(obj, field_name, fp)
+                    except OSError:
+                        missing += 1
+                        continue
+                    if getattr(obj, width_field) is not None:
+                        measured.append(obj)
+
+                for batch in _chunks(measured, BATCH_SIZE):
+                    model.objects.bulk_update(batch, [width_field, height_field])
+
+                self.stdout.write(self.style.SUCCESS(
+                    f"✔  {model.__name__}.{field_name}: {len(measured)} measured, "
+                    f"{len(rows) - len(measured) - missing} not raster images"
+                ))
+                if missing:
+                    self.stderr.write(self.style.WARNING(
+                        f"{model.__name__}.{field_name}: {missing} files missing from storage"
+                    ))
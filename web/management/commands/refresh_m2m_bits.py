@@ -0,0 +1,31 @@
+# myapp/management/commands/refresh_m2m_bits.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from web.models import Direction, University, refresh_m2m_bits
+
+from ._import_helpers import BATCH_SIZE, _chunks
+
+
+class Command(BaseCommand):
+    """
+    Recompute every University / Direction M2M bitmask column from the
+    through tables. Run once after the migration that adds the columns
+    (existing rows start at 0, so the bitmask filters match nothing) and
+    whenever the columns may have drifted, e.g. after raw SQL edits.
+    The command is *idempotent* – safe to rerun any time.
+
+    Example:
+        python manage.py refresh_m2m_bits
+    """
+
+    help = "Backfill the education type/language bitmask columns from the M2M tables."
+
+    def handle(self, *args, **opts):
+        for model in (University, Direction):
+            pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+            for batch in _chunks(pks, BATCH_SIZE):
+                with transaction.atomic():
+                    for m2m_field in model.M2M_BITS:
+                        refresh_m2m_bits(model, m2m_field, batch)
+            self.stdout.write(self.style.SUCCESS(f"✔  Refreshed {model.__name__} bitmasks"))
@@ -1,11 +1,106 @@
 # models.py
-from django.db import models
+import time
+from functools import lru_cache
+
+from django.core.files.images import get_image_dimensions
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 from ckeditor.fields import RichTextField
+from fast_update.query import FastUpdateQuerySet
+
+SLUG_SAVE_ATTEMPTS = 5
+LOOKUP_CACHE_TTL = 300  # seconds – bounds staleness across worker processes
+M2M_MASK_BITS = 63      # ids 0..62 fit a PositiveBigIntegerField bitmask
+
+
+def id_mask(ids):
+    """Bitmask with bit *id* set for every id that fits in M2M_MASK_BITS."""
+    mask = 0
+    for pk in ids:
+        if 0 <= pk < M2M_MASK_BITS:
+            mask |= 1 << pk
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def _slug(value):
+    """``slugify`` is pure but slow (unicode normalisation + regex) – memoize it."""
+    return slugify(value)
+
+
+def _free_slug(instance, slug_field, base_slug):
+    """
+    First free ``base_slug[-N]`` – fetches only the indexed slug column of
+    the rows sharing the prefix, no model instances are built.
+    """
+    taken = set(
+        type(instance)._default_manager
+        .filter(**{f"{slug_field}__startswith": base_slug})
+        .exclude(pk=instance.pk)
+        .values_list(slug_field, flat=True)
+        .iterator()
+    )
+    slug, counter = base_slug, 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+def _save_with_unique_slug(instance, slug_field, base_slug, save, *args, **kwargs):
+    """
+    Save with *base_slug* and let the unique index reject duplicates; only on
+    a collision look up the taken slugs and retry with the next free suffix.
+    Any other IntegrityError (NOT NULL, FK, ...) is re-raised straight away.
+    """
+    setattr(instance, slug_field, base_slug)
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        try:
+            with transaction.atomic():               # keeps PostgreSQL usable after a failed INSERT
+                return save(*args, **kwargs)
+        except IntegrityError:
+            if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
+            slug = _free_slug(instance, slug_field, base_slug)
+            if slug == getattr(instance, slug_field):   # slug was free – not a clash
+                raise
+            setattr(instance, slug_field, slug)
 
 # --- Filter Models ---
 
-class InstitutionCategory(models.Model):
+class CachedLookupMixin:
+    """
+    Keeps a tiny, near-static lookup table in process memory.
+    Invalidated on save/delete in this process and after LOOKUP_CACHE_TTL
+    everywhere else (bulk writes and other workers don't fire our signals).
+    """
+    _lookup_cache = None    # (expires_at, ({'id': .., 'name': ..}, ...))
+
+    @classmethod
+    def options(cls):
+        """The whole table as ``{'id', 'name'}`` dicts ordered by name (what filter UIs need)."""
+        cached = cls.__dict__.get('_lookup_cache')
+        if cached is None or cached[0] < time.monotonic():
+            rows = cls.objects.order_by('name').values('id', 'name').iterator(chunk_size=500)
+            cached = (time.monotonic() + LOOKUP_CACHE_TTL, tuple(rows))
+            cls._lookup_cache = cached
+        return cached[1]
+
+    @classmethod
+    def clear_cache(cls):
+        cls._lookup_cache = None
+
+
+@receiver([post_save, post_delete])
+def _clear_lookup_cache(sender, **kwargs):
+    if isinstance(sender, type) and issubclass(sender, CachedLookupMixin):
+        sender.clear_cache()
+
+
+class InstitutionCategory(CachedLookupMixin, models.Model):
     """Represents the type of institution (e.g., Private, State, International)."""
     name = models.CharField(max_length=100, unique=True, verbose_name="OTM turi")
 
@@ -16,7 +111,7 @@ class InstitutionCategory(models.Model):
         verbose_name = "OTM Turi"
         verbose_name_plural = "OTM Turlari"
 
-class Location(models.Model):
+class Location(CachedLookupMixin, models.Model):
     """Represents a geographical location (region/city)."""
     name = models.CharField(max_length=100, unique=True, verbose_name="Manzil")
 
@@ -27,7 +122,7 @@ class Location(models.Model):
         verbose_name = "Manzil"
         verbose_name_plural = "Manzillar"
 
-class Category(models.Model):
+class Category(CachedLookupMixin, models.Model):
     """Represents the category of an educational direction (e.g., IT, Medicine)."""
     name = models.CharField(max_length=200, unique=True, verbose_name="Ta'lim yo'nalishi")
 
@@ -39,7 +134,7 @@ class Category(models.Model):
         verbose_name_plural = "Ta'lim Yo'nalishlari"
         ordering = ['name']
 
-class EducationType(models.Model):
+class EducationType(CachedLookupMixin, models.Model):
     """Represents the type of education (e.g., Full-time, Part-time)."""
     name = models.CharField(max_length=100, unique=True, verbose_name="Ta'lim turi")
 
@@ -50,7 +145,7 @@ class EducationType(models.Model):
         verbose_name = "Ta'lim Turi"
         verbose_name_plural = "Ta'lim Turlari"
 
-class EducationLanguage(models.Model):
+class EducationLanguage(CachedLookupMixin, models.Model):
     """Represents the language of instruction."""
     name = models.CharField(max_length=100, unique=True, verbose_name="Ta'lim tili")
 
@@ -61,10 +156,26 @@ class EducationLanguage(models.Model):
         verbose_name = "Ta'lim Tili"
         verbose_name_plural = "Ta'lim Tillari"
 
-class Degree(models.Model):
+@lru_cache(maxsize=256)
+def _degree_key(name):
+    """'bachelor' / 'master' / 'other' for a degree name – a handful of distinct names, so memoize."""
+    name = name.lower()
+    if 'bakal' in name:
+        return 'bachelor'
+    if 'magis' in name:
+        return 'master'
+    return 'other'
+
+
+class Degree(CachedLookupMixin, models.Model):
     """Represents the degree level (e.g., Bachelor, Master)."""
     name = models.CharField(max_length=100, unique=True, verbose_name="Daraja")
 
+    @property
+    def degree_key(self):
+        """Normalised degree group the detail page lists directions under."""
+        return _degree_key(self.name)
+
     def __str__(self):
         return self.name
 
@@ -102,19 +213,104 @@ class Gallery(models.Model):
         on_delete=models.CASCADE,
         related_name="gallery_items"
     )
-    image = models.FileField(upload_to='gallery_images/', blank=True, null=True, help_text="Gallery image")
+    image = models.ImageField(
+        upload_to='gallery_images/', blank=True, null=True, help_text="Gallery image",
+    )
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
     link = models.URLField(max_length=255, blank=True, null=True, verbose_name="Link")
 
+    # image field → (width, height) columns kept by set_image_dimensions()
+    IMAGE_DIMENSIONS = {'image': ('image_width', 'image_height')}
+
     def __str__(self):
         return f"Gallery {self.pk}"
 
 # --- Main Models ---
 
+# University columns only the detail page shows – list cards never read them
+# (the cards do render `description`)
+UNIVERSITY_DETAIL_ONLY_FIELDS = (
+    'about_grant', 'license_file', 'admission_phone', 'support_email',
+    'instagram_username', 'telegram_username', 'facebook_username', 'youtube_username',
+    'latitude', 'longitude', 'education_type_bits', 'education_language_bits',
+)
+# The university joined onto direction pages only shows its header fields
+DIRECTION_UNIVERSITY_DEFERRED = tuple(
+    f'university__{name}' for name in ('description', *UNIVERSITY_DETAIL_ONLY_FIELDS)
+)
+
+
+class UniversityQuerySet(FastUpdateQuerySet):
+    def for_list(self):
+        """List rows don't render the grant text or contact details – leave them in the DB."""
+        return self.defer(*UNIVERSITY_DETAIL_ONLY_FIELDS)
+
+    def with_related(self):
+        """
+        Canonical select/prefetch set for university lists – avoids N+1 per row.
+        The list templates read ``university.directions`` (``.count`` included,
+        which a prefetched relation answers from memory), so the directions
+        come prefetched rather than as the ``directions_count`` subquery.
+        """
+        return self.select_related(
+            'institution_category', 'location'
+        ).prefetch_related(
+            'education_types', 'education_languages', 'degrees',
+            # the parent university is already at hand – only join the category,
+            # and list cards never render a direction's rich text
+            models.Prefetch(
+                'directions',
+                queryset=Direction.objects.select_related(None).select_related('category').defer(
+                    'direction_description', 'requirement',
+                    'education_type_bits', 'education_language_bits',
+                ),
+            ),
+        )
+
+    def with_directions_count(self):
+        """
+        ``directions_count`` as a correlated subquery on the indexed
+        ``Direction.university_id`` – no GROUP BY over the university's columns.
+        """
+        return self.annotate(
+            directions_count=Coalesce(models.Subquery(
+                Direction.objects.filter(university=models.OuterRef('pk'))
+                .order_by().values('university').annotate(n=models.Count('pk')).values('n')
+            ), 0),
+        )
+
+
+class DirectionQuerySet(FastUpdateQuerySet):
+    def for_list(self):
+        """
+        List rows: join university/category but only the university's card
+        columns. The cards render ``direction_description``, so it stays loaded.
+        """
+        return self.select_related('university', 'category').defer(
+            'requirement', 'education_type_bits', 'education_language_bits',
+            *DIRECTION_UNIVERSITY_DEFERRED,
+        )
+
+
+class DirectionManager(models.Manager.from_queryset(DirectionQuerySet)):
+    """
+    Directions are almost never shown without their university and category
+    (``__str__`` alone reads ``university.full_name``) – JOIN them by default.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('university', 'category')
+
+
 class University(models.Model):
     """Represents a university."""
     full_name = models.CharField(max_length=255, verbose_name="To'liq nomi")
     slug = models.SlugField(max_length=255, unique=True, blank=True, help_text="URL uchun qisqa nom")
-    logo = models.FileField(upload_to='university_logos/', blank=True, null=True, help_text="Logo fayl yo'li") # Assuming path stored as string
+    logo = models.ImageField(
+        upload_to='university_logos/', blank=True, null=True, help_text="Logo fayl yo'li",
+    )
+    logo_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    logo_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
     description = RichTextField(blank=True, null=True, verbose_name="Tavsif")
     about_grant = RichTextField(blank=True, null=True, verbose_name="Grant haqida")
     address = models.CharField(max_length=255, blank=True, null=True, verbose_name="Manzil")
@@ -132,9 +328,13 @@ class University(models.Model):
     admission_deadline = models.DateTimeField(blank=True, null=True, verbose_name="Qabul tugash sanasi") # Store as Char due to format
     minimal_tuition_fee = models.PositiveIntegerField(blank=True, null=True, verbose_name="Minimal kontrakt narxi")
     maximal_tuition_fee = models.PositiveIntegerField(blank=True, null=True, verbose_name="Maksimal kontrakt narxi")
-    latitude = models.CharField(max_length=50, blank=True, null=True, verbose_name="Kenglik")
-    longitude = models.CharField(max_length=50, blank=True, null=True, verbose_name="Uzunlik")
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Kenglik")
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Uzunlik")
     is_open_for_admission = models.BooleanField(default=False, verbose_name="Qabul ochiqmi?")
+
+    # Denormalised M2M ids (see id_mask) – filters test bits instead of joining
+    education_type_bits = models.PositiveBigIntegerField(default=0, editable=False)
+    education_language_bits = models.PositiveBigIntegerField(default=0, editable=False)
     
     
     # --- Relationships ---
@@ -167,15 +367,21 @@ class University(models.Model):
     )
     # gallery = models.JSONField(blank=True, null=True) # Store gallery paths if needed
 
+    objects = UniversityQuerySet.as_manager()   # with_related() + fast_update()
+
+    # M2M field → bitmask column kept in sync by refresh_m2m_bits()
+    M2M_BITS = {
+        'education_types': 'education_type_bits',
+        'education_languages': 'education_language_bits',
+    }
+    # image field → (width, height) columns kept by set_image_dimensions()
+    IMAGE_DIMENSIONS = {'logo': ('logo_width', 'logo_height')}
+
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.full_name)
-            # Ensure uniqueness if slugifying results in duplicates
-            counter = 1
-            original_slug = self.slug
-            while University.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
+            return _save_with_unique_slug(
+                self, 'slug', _slug(self.full_name), super().save, *args, **kwargs
+            )
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -185,6 +391,14 @@ class University(models.Model):
         verbose_name = "Universitet"
         verbose_name_plural = "Universitetlar"
         ordering = ['full_name']
+        indexes = [
+            models.Index(fields=['full_name']),
+            models.Index(fields=['is_open_for_admission', 'full_name']),
+            models.Index(fields=['institution_category', 'location']),
+            # price range filters and the price_low / price_high sorts
+            models.Index(fields=['minimal_tuition_fee']),
+            models.Index(fields=['maximal_tuition_fee']),
+        ]
 
 
 class Direction(models.Model):
@@ -212,7 +426,11 @@ class Direction(models.Model):
     is_open_for_admission = models.BooleanField(default=False, verbose_name="Qabul ochiqmi?")
     application_start_date = models.DateTimeField(blank=True, null=True, verbose_name="Ariza topshirish boshlanish sanasi") # Store as Char due to format
     application_deadline = models.DateTimeField(blank=True, null=True, verbose_name="Ariza topshirish tugash sanasi") # Store as Char due to format
-    is_promoted = models.IntegerField(default=0, blank=True, null=True, verbose_name="Targ'ib qilinganmi?") # Assuming integer
+    is_promoted = models.PositiveIntegerField(default=0, blank=True, null=True, verbose_name="Targ'ib qilinganmi?") # Assuming integer
+
+    # Denormalised M2M ids (see id_mask) – filters test bits instead of joining
+    education_type_bits = models.PositiveBigIntegerField(default=0, editable=False)
+    education_language_bits = models.PositiveBigIntegerField(default=0, editable=False)
 
     # --- Relationships ---
     education_types = models.ManyToManyField(
@@ -233,22 +451,143 @@ class Direction(models.Model):
     # tuition_fees = models.JSONField(blank=True, null=True) # Store complex tuition fee structure if needed
     # contract_types = models.JSONField(blank=True, null=True) # Store contract types if needed
 
+    objects = DirectionManager()   # select_related by default + fast_update()
+
+    # M2M field → bitmask column kept in sync by refresh_m2m_bits()
+    M2M_BITS = {
+        'education_types': 'education_type_bits',
+        'education_languages': 'education_language_bits',
+    }
+
     def save(self, *args, **kwargs):
         if not self.direction_slug:
-            base_slug = slugify(f"{self.university.slug}-{self.direction_name}")
-            self.direction_slug = base_slug
-            # Ensure uniqueness
-            counter = 1
-            while Direction.objects.filter(direction_slug=self.direction_slug).exclude(pk=self.pk).exists():
-                self.direction_slug = f"{base_slug}-{counter}"
-                counter += 1
+            base_slug = _slug(f"{self.university.slug}-{self.direction_name}")
+            return _save_with_unique_slug(
+                self, 'direction_slug', base_slug, super().save, *args, **kwargs
+            )
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.university.full_name} - {self.direction_name}"
+        # memoized per instance; re-built only if the university/name changed
+        key = (self.university_id, self.direction_name)
+        cached = self.__dict__.get('_str_cache')
+        if cached is None or cached[0] != key:
+            cached = self._str_cache = (key, f"{self.university.full_name} - {self.direction_name}")
+        return cached[1]
 
     class Meta:
         verbose_name = "Yo'nalish"
         verbose_name_plural = "Yo'nalishlar"
         ordering = ['university__full_name', 'direction_name']
-
+        indexes = [
+            models.Index(fields=['university', 'direction_name']),
+            models.Index(fields=['university', 'is_promoted']),
+            models.Index(fields=['is_open_for_admission']),
+            # only the handful of promoted rows – keeps "promoted first" lists an index scan
+            models.Index(
+                fields=['-is_promoted', 'university'],
+                condition=models.Q(is_promoted__gt=0),
+                name='direction_promoted_partial',
+            ),
+        ]
+
+
+def refresh_m2m_bits(model, m2m_field, owner_ids):
+    """Recompute ``model.M2M_BITS[m2m_field]`` for *owner_ids* from the through table."""
+    field = model._meta.get_field(m2m_field)
+    src, dst = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+    masks = dict.fromkeys(owner_ids, 0)
+    for owner_id, target_id in field.remote_field.through.objects.filter(
+        **{f"{src}__in": owner_ids}
+    ).values_list(src, dst):
+        masks[owner_id] |= id_mask([target_id])
+
+    bits_field = model.M2M_BITS[m2m_field]
+    objs = [model(pk=pk, **{bits_field: mask}) for pk, mask in masks.items()]
+    model.objects.fast_update(objs, [bits_field])
+
+
+@receiver(m2m_changed)
+def _sync_m2m_bits(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+    for owner_model in (University, Direction):
+        for m2m_field in owner_model.M2M_BITS:
+            field = owner_model._meta.get_field(m2m_field)
+            if sender is not field.remote_field.through:
+                continue
+            if not reverse:
+                if action != 'pre_clear':
+                    refresh_m2m_bits(owner_model, m2m_field, [instance.pk])
+                continue
+            # e.g. education_type.university_set.add(...) – owners are in pk_set,
+            # except for clear(), where they have to be remembered beforehand
+            if action == 'pre_clear':
+                instance._m2m_bits_owners = list(sender.objects.filter(
+                    **{f"{field.m2m_reverse_field_name()}_id": instance.pk}
+                ).values_list(f"{field.m2m_field_name()}_id", flat=True))
+                continue
+            owners = instance.__dict__.pop('_m2m_bits_owners', []) if action == 'post_clear' else pk_set
+            if owners:
+                refresh_m2m_bits(owner_model, m2m_field, list(owners))
+
+
+def _m2m_bits_fields(target_model):
+    """``(owner_model, m2m_field)`` of every bitmask M2M pointing at *target_model*."""
+    return [
+        (owner_model, m2m_field)
+        for owner_model in (University, Direction)
+        for m2m_field in owner_model.M2M_BITS
+        if owner_model._meta.get_field(m2m_field).related_model is target_model
+    ]
+
+
+@receiver(pre_delete, sender=EducationType)
+@receiver(pre_delete, sender=EducationLanguage)
+def _remember_m2m_bits_owners(sender, instance, **kwargs):
+    # deleting a type/language cascades through the join tables without
+    # m2m_changed – note whose bits it is in before the rows are gone
+    owners = {}
+    for owner_model, m2m_field in _m2m_bits_fields(sender):
+        field = owner_model._meta.get_field(m2m_field)
+        owners[owner_model, m2m_field] = list(field.remote_field.through.objects.filter(
+            **{f"{field.m2m_reverse_field_name()}_id": instance.pk}
+        ).values_list(f"{field.m2m_field_name()}_id", flat=True))
+    if owners:
+        instance._m2m_bits_deleted_owners = owners
+
+
+@receiver(post_delete, sender=EducationType)
+@receiver(post_delete, sender=EducationLanguage)
+def _refresh_deleted_m2m_bits(sender, instance, **kwargs):
+    for (owner_model, m2m_field), owner_ids in instance.__dict__.pop(
+        '_m2m_bits_deleted_owners', {}
+    ).items():
+        if owner_ids:
+            refresh_m2m_bits(owner_model, m2m_field, owner_ids)
+
+
+def set_image_dimensions(instance, field_name, file=None):
+    """
+    Fill the ``IMAGE_DIMENSIONS`` columns of *field_name* from *file* (default:
+    the stored file). Non-raster files (SVG logos) leave them None. Kept by
+    hand instead of ImageField(width_field=...), which re-opens the file on
+    every row load whose columns are empty.
+    """
+    width_field, height_field = instance.IMAGE_DIMENSIONS[field_name]
+    file = file if file is not None else getattr(instance, field_name)
+    width, height = get_image_dimensions(file) if file else (None, None)
+    setattr(instance, width_field, width)
+    setattr(instance, height_field, height)
+
+
+@receiver(pre_save, sender=University)
+@receiver(pre_save, sender=Gallery)
+def _measure_uploaded_images(sender, instance, **kwargs):
+    # admin uploads: measure the new file while it is still in memory
+    for field_name in sender.IMAGE_DIMENSIONS:
+        file = getattr(instance, field_name)
+        if not file:
+            set_image_dimensions(instance, field_name)
+        elif not file._committed:
+            set_image_dimensions(instance, field_name, file.file)
@@ -1,10 +1,19 @@
 from django import template
+from django.core.cache import cache
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+import hashlib
 import json
+from urllib.parse import urlencode
 
 register = template.Library()
 
+FILTER_SUMMARY_TIMEOUT = 300  # option names rarely change; let the TTL expire them
+ACTIVE_FILTERS_EXCLUDE = frozenset(('page', 'search'))
+JSON_ENCODE_CACHE_SIZE = 64
+
+_json_encode_cache = {}   # id(data) -> (data, encoded)
+
 
 @register.inclusion_tag('includes/filter_checkbox_group.html')
 def checkbox_filter(title, field_name, options, selected_values, icon_class="fas fa-filter", collapsible=True):
@@ -14,7 +23,7 @@ def checkbox_filter(title, field_name, options, selected_values, icon_class="fas
     Args:
         title: Display title for the filter group
         field_name: HTML input name attribute
-        options: Queryset or list of options with 'id' and 'name' attributes
+        options: Iterable of ``{'id', 'name'}`` option dicts
         selected_values: List of currently selected values
         icon_class: FontAwesome icon class
         collapsible: Whether the section should be collapsible
@@ -23,7 +32,7 @@ def checkbox_filter(title, field_name, options, selected_values, icon_class="fas
         'title': title,
         'field_name': field_name,
         'options': options,
-        'selected_values': [str(v) for v in selected_values] if selected_values else [],
+        'selected_values': frozenset(str(v) for v in (selected_values or ())),
         'icon_class': icon_class,
         'collapsible': collapsible,
         'collapse_id': f"{field_name}Collapse"
@@ -101,10 +110,17 @@ def pagination_url(context, page_number):
         context: Template context
         page_number: Target page number
     """
-    request = context['request']
-    query_dict = request.GET.copy()
-    query_dict['page'] = page_number
-    return f"?{query_dict.urlencode()}"
+    base = _pagination_base(context['request'])
+    return f"?{base}&page={page_number}" if base else f"?page={page_number}"
+
+
+def _pagination_base(request):
+    """The query string minus ``page``, encoded once per request for all page links."""
+    try:
+        return request._pagination_base
+    except AttributeError:
+        request._pagination_base = canonical_qs(request.GET, drop=('page',))
+        return request._pagination_base
 
 
 @register.simple_tag(takes_context=True)
@@ -116,17 +132,10 @@ def active_filters_count(context):
         context: Template context with request
     """
     request = context['request']
-    exclude_params = {'page', 'search'}
-    
-    count = 0
-    for key, values in request.GET.lists():
-        if key not in exclude_params:
-            if isinstance(values, list):
-                count += len([v for v in values if v])
-            elif values:
-                count += 1
-    
-    return count
+    return sum(
+        1 for key, values in request.GET.lists() if key not in ACTIVE_FILTERS_EXCLUDE
+        for value in values if value
+    )
 
 
 @register.simple_tag(takes_context=True)
@@ -139,9 +148,10 @@ def clear_filters_url(context, keep_search=False):
         keep_search: Whether to preserve search parameter
     """
     request = context['request']
+    search = request.GET.get('search') if keep_search else None
     
-    if keep_search and request.GET.get('search'):
-        return f"?search={request.GET.get('search')}"
+    if search:
+        return f"?search={search}"
     
     return request.path
 
@@ -152,32 +162,63 @@ def get_selected_names(options, selected_ids):
     Get names of selected options for display.
     
     Args:
-        options: Queryset or list of options
+        options: Iterable of ``{'id', 'name'}`` option dicts
         selected_ids: List of selected IDs
     """
     if not selected_ids:
         return []
     
-    selected_ids = [str(sid) for sid in selected_ids]
+    selected_ids = frozenset(map(str, selected_ids))
     names = []
     
     for option in options:
-        if str(option.id) in selected_ids:
-            names.append(option.name)
+        if str(option['id']) in selected_ids:
+            names.append(option['name'])
     
     return names
 
 
+def canonical_qs(query, drop=()):
+    """
+    *query* encoded with its ``(key, value)`` pairs sorted, so the same
+    filters always produce the same URL and cache key whatever their order.
+    """
+    return urlencode(sorted((k, v) for k, values in query.lists() if k not in drop for v in values))
+
+
+def _query_url(request, query):
+    """``?<query>`` or the bare path when nothing is left (empty lists encode to nothing)."""
+    encoded = canonical_qs(query)
+    return f"?{encoded}" if encoded else request.path
+
+
 @register.inclusion_tag('includes/filter_summary.html', takes_context=True)
 def filter_summary(context):
     """
     Display summary of active filters with remove buttons.
     
+    The result only depends on the path and the GET parameters, so it is
+    cached per canonical (sorted) query and shared between visitors.
+    
     Args:
         context: Template context
     """
     request = context['request']
+    canonical = f"{request.path}?{canonical_qs(request.GET)}"
+    digest = hashlib.md5(canonical.encode(), usedforsecurity=False).hexdigest()
+    return cache.get_or_set(
+        f"filter_summary:{digest}",
+        lambda: _build_filter_summary(context),
+        FILTER_SUMMARY_TIMEOUT,
+    )
+
+
+def _build_filter_summary(context):
+    request = context['request']
+    params = request.GET
     active_filters = []
+    # One mutable copy of the query string, edited and restored per remove link
+    query = params.copy()
     
     # Get filter context data (assuming it's passed from view)
     filter_options = {
@@ -201,24 +242,26 @@ def filter_summary(context):
         'category': ('Yo\'nalish', filter_options['categories']),
     }
     
-    for param, values in request.GET.lists():
+    # Only the filters the page offers – on the university list the
+    # `universities` key is its page of results, not an option list
+    page_filters = context.get('selected_filters')
+    
+    for param, values in params.lists():
+        if page_filters is not None and param not in page_filters:
+            continue
         if param in param_mapping and values:
             title, options = param_mapping[param]
             selected_names = get_selected_names(options, values)
             
             for value, name in zip(values, selected_names):
-                # Create URL without this specific filter
-                new_query = request.GET.copy()
-                current_values = new_query.getlist(param)
+                # URL without this specific filter value, then restore the param
+                current_values = list(values)
                 if value in current_values:
                     current_values.remove(value)
                 
-                if current_values:
-                    new_query.setlist(param, current_values)
-                else:
-                    new_query.pop(param, None)
-                
-                remove_url = f"?{new_query.urlencode()}" if new_query else request.path
+                query.setlist(param, current_values)
+                remove_url = _query_url(request, query)
+                query.setlist(param, values)
                 
                 active_filters.append({
                     'title': title,
@@ -227,14 +270,16 @@ def filter_summary(context):
                 })
     
     # Handle special filters
-    if request.GET.get('min_price') or request.GET.get('max_price'):
-        min_p = request.GET.get('min_price', '0')
-        max_p = request.GET.get('max_price', '∞')
+    if params.get('min_price') or params.get('max_price'):
+        min_p = params.get('min_price', '0')
+        max_p = params.get('max_price', '∞')
         
-        new_query = request.GET.copy()
-        new_query.pop('min_price', None)
-        new_query.pop('max_price', None)
-        remove_url = f"?{new_query.urlencode()}" if new_query else request.path
+        prices = {key: query.getlist(key) for key in ('min_price', 'max_price')}
+        for key in prices:
+            query.setlist(key, [])
+        remove_url = _query_url(request, query)
+        for key, values in prices.items():
+            query.setlist(key, values)
         
         active_filters.append({
             'title': 'Narx oralig\'i',
@@ -242,10 +287,11 @@ def filter_summary(context):
             'remove_url': remove_url
         })
     
-    if request.GET.get('admission_status') == 'open':
-        new_query = request.GET.copy()
-        new_query.pop('admission_status', None)
-        remove_url = f"?{new_query.urlencode()}" if new_query else request.path
+    if params.get('admission_status') == 'open':
+        status = query.getlist('admission_status')
+        query.setlist('admission_status', [])
+        remove_url = _query_url(request, query)
+        query.setlist('admission_status', status)
         
         active_filters.append({
             'title': 'Qabul holati',
@@ -254,9 +300,9 @@ def filter_summary(context):
         })
     
     # Get clear filters URL
-    request = context['request']
-    if request.GET.get('search'):
-        clear_url = f"?search={request.GET.get('search')}"
+    search = params.get('search')
+    if search:
+        clear_url = f"?search={search}"
     else:
         clear_url = request.path
     
@@ -275,4 +321,15 @@ def json_encode(data):
     Args:
         data: Python data structure to encode
     """
-    return mark_safe(json.dumps(data)) 
\ No newline at end of file
+    if not isinstance(data, tuple):
+        return mark_safe(json.dumps(data))
+    # Tuples are the process-cached lookup options: the same object on every
+    # render until it expires, so its encoding is memoized by identity (the
+    # entry holds *data*, so the id can't be reused while it is cached).
+    entry = _json_encode_cache.get(id(data))
+    if entry is None or entry[0] is not data:
+        if len(_json_encode_cache) >= JSON_ENCODE_CACHE_SIZE:
+            _json_encode_cache.clear()   # stale option tuples; next renders re-fill
+        entry = (data, mark_safe(json.dumps(data)))
+        _json_encode_cache[id(data)] = entry
+    return entry[1] 
\ No newline at end of file
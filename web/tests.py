@@ -1,3 +1,163 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import (
+    CachedLookupMixin, Category, Degree, Direction, EducationLanguage,
+    EducationType, InstitutionCategory, Location, TuitionFee, University,
+)
+
+
+class FilterApiQueryCountTests(TestCase):
+    """
+    The JSON filter endpoints must run a fixed number of queries however many
+    rows a page holds (no per-row lookups), and fewer once the caches are warm.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = InstitutionCategory.objects.create(name="Davlat")
+        location = Location.objects.create(name="Toshkent")
+        field = Category.objects.create(name="IT")
+        edu_types = [EducationType.objects.create(name=name) for name in ("Kunduzgi", "Sirtqi")]
+        languages = [EducationLanguage.objects.create(name=name) for name in ("O'zbek", "Rus")]
+        degrees = [Degree.objects.create(name=name) for name in ("Bakalavr", "Magistratura")]
+
+        for i in range(5):
+            university = University.objects.create(
+                full_name=f"Universitet {i}",
+                institution_category=category,
+                location=location,
+                minimal_tuition_fee=10_000_000,
+                maximal_tuition_fee=20_000_000,
+            )
+            university.education_types.set(edu_types)
+            university.education_languages.set(languages)
+            university.degrees.set(degrees)
+            for j in range(2):
+                direction = Direction.objects.create(
+                    university=university, category=field, direction_name=f"Yo'nalish {j}",
+                )
+                direction.education_types.set(edu_types)
+                direction.education_languages.set(languages)
+                direction.degrees.set(degrees)
+                TuitionFee.objects.create(
+                    direction=direction, education_type=edu_types[0], local_tuition_fee=12_000_000,
+                )
+
+    def setUp(self):
+        cache.clear()
+        for model in CachedLookupMixin.__subclasses__():
+            model.clear_cache()
+
+    def assertGetQueries(self, num, url, data=None):
+        with self.assertNumQueries(num):
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        return response.json()
+
+    def test_university_filter_api(self):
+        url = reverse('universities:university_filter_api')
+        # page rows + count + directions counts
+        data = self.assertGetQueries(3, url)
+        self.assertEqual(len(data['universities']), 5)
+        self.assertEqual(data['universities'][0]['directions_count'], 2)
+        # the paginator count is cached
+        self.assertGetQueries(2, url)
+
+    def test_university_filter_api_filtered(self):
+        url = reverse('universities:university_filter_api')
+        params = {'education_type': EducationType.objects.first().pk, 'degree': Degree.objects.first().pk}
+        data = self.assertGetQueries(3, url, params)
+        self.assertEqual(len(data['universities']), 5)
+        self.assertGetQueries(2, url, params)
+
+    def test_university_filter_api_unmatched_category_name(self):
+        url = reverse('universities:university_filter_api')
+        # no category is named like this – an empty result, not an error
+        # (only the category names are read, to match the term against)
+        data = self.assertGetQueries(1, url, {'institution_category': 'mavjud-emas'})
+        self.assertEqual(data['universities'], [])
+        self.assertEqual(data['pagination']['total_count'], 0)
+
+    def test_direction_filter_api(self):
+        url = reverse('universities:direction_filter_api')
+        # page rows + count + degrees/languages/types (lookup table + join rows) + first fees
+        data = self.assertGetQueries(9, url)
+        self.assertEqual(len(data['directions']), 10)
+        self.assertEqual(len(data['directions'][0]['degrees']), 2)
+        self.assertEqual(data['directions'][0]['tuition_fee'], 12_000_000)
+        # count and lookup tables are cached; only the page's own rows are read
+        self.assertGetQueries(5, url)
+
+    def test_filter_options_api(self):
+        url = reverse('universities:filter_options_api')
+        # locations + three lookup tables + price bounds + categories + universities
+        data = self.assertGetQueries(8, url)['data']
+        self.assertEqual(data['price_range'], {'min': 10_000_000, 'max': 20_000_000})
+        self.assertEqual(data['universities'][0]['direction_count'], 2)
+        # the encoded body is served from the cache
+        self.assertGetQueries(0, url)
+
+    def test_filter_options_api_by_type(self):
+        url = reverse('universities:filter_options_api')
+        self.assertGetQueries(2, url, {'type': 'directions'})
+        # the university option set doesn't touch the direction side
+        self.assertGetQueries(6, url, {'type': 'universities'})
+        self.assertGetQueries(0, url, {'type': 'unknown'})
+
+
+class FilterApiErrorTests(TestCase):
+    """
+    A bad ?page= is a client error: 400, and nothing is logged. Non-numeric
+    filter values are ignored rather than mistaken for one.
+    """
+
+    def test_bad_page_is_a_client_error(self):
+        for name in ('universities:university_filter_api', 'universities:direction_filter_api'):
+            for page in ('abc', '99'):
+                with self.subTest(name=name, page=page), self.assertNoLogs('web.views'):
+                    response = self.client.get(reverse(name), {'page': page})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+    def test_non_decimal_digits_are_ignored(self):
+        # '²'.isdigit() is True, but int('²') raises
+        cases = (
+            ('universities:university_filter_api', {'location': '²', 'min_price': '²', 'max_price': '²'}),
+            ('universities:direction_filter_api', {'university': '²', 'category': '²'}),
+        )
+        for name, params in cases:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name), params)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.json()['success'])
+
+
+class ForListQuerySetTests(TestCase):
+    """List querysets load what the cards render – no lazy query per card."""
+
+    @classmethod
+    def setUpTestData(cls):
+        university = University.objects.create(full_name="Universitet", description="<p>U</p>")
+        Direction.objects.create(
+            university=university, direction_name="Yo'nalish", direction_description="<p>D</p>",
+        )
+
+    def test_university_description_is_loaded(self):
+        with self.assertNumQueries(1):
+            universities = list(University.objects.for_list())
+            self.assertEqual(universities[0].description, "<p>U</p>")
+
+    def test_direction_description_is_loaded(self):
+        with self.assertNumQueries(1):
+            directions = list(Direction.objects.for_list())
+            self.assertEqual(directions[0].direction_description, "<p>D</p>")
+            self.assertEqual(directions[0].university.full_name, "Universitet")
+
+    def test_university_directions_count_is_prefetched(self):
+        universities = list(University.objects.for_list().with_related())
+        with self.assertNumQueries(0):
+            self.assertEqual(universities[0].directions.count(), 1)
+            self.assertEqual(universities[0].directions.all()[0].direction_name, "Yo'nalish")
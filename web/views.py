@@ -1,38 +1,373 @@
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
-from django.db.models import Q, Count, Min, Max
+from django.db.models import Exists, F, OuterRef, Prefetch, Q, Count, Min, Max
+from django.db.models.functions import Left
+from django.db.models.lookups import GreaterThan
 from django.urls import reverse
-from django.http import JsonResponse
-from django.core.paginator import Paginator
-from django.template.loader import render_to_string
+from django.http import HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import InvalidPage, Paginator
+from django.db import DatabaseError
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
+from functools import lru_cache
+import hashlib
 import json
+import logging
+import random
 
 from .models import (
     University, Direction, 
     InstitutionCategory, Location, Category, 
-    EducationType, EducationLanguage, Degree
+    EducationType, EducationLanguage, Degree, TuitionFee,
+    DIRECTION_UNIVERSITY_DEFERRED, M2M_MASK_BITS, id_mask,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _int_ids(raw_ids):
+    """
+    The numeric values of a multi-value GET param (anything else is ignored) –
+    ``isdecimal``, not ``isdigit``, which lets through ``²`` that int() rejects.
+    """
+    return [int(i) for i in raw_ids if i.isdecimal()]
+
+
+def _institution_category_ids(values):
+    """
+    Ids for the ``institution_category`` filter, which takes both ids and
+    names (xususiy, davlat, xalqaro) – names are matched in the cached options.
+    """
+    ids = []
+    for value in values:
+        if value.isdecimal():
+            ids.append(int(value))
+        else:
+            ids.extend(_name_match_ids(InstitutionCategory, value))
+    return ids
+
+
+def _m2m_ids_q(model, m2m_field, raw_ids):
+    """
+    "Has any of these ids" filter on an M2M without a JOIN (and so without the
+    DISTINCT a join needs): a bitwise test on the row for fields denormalised
+    in ``model.M2M_BITS``, otherwise an ``EXISTS`` over the through table.
+    """
+    ids = _int_ids(raw_ids)
+    if not ids:
+        return Q()
+    bits_field = model.M2M_BITS.get(m2m_field)
+    if bits_field and all(i < M2M_MASK_BITS for i in ids):
+        return Q(GreaterThan(F(bits_field).bitand(id_mask(ids)), 0))
+    field = model._meta.get_field(m2m_field)
+    return Q(Exists(field.remote_field.through.objects.filter(**{
+        f"{field.m2m_field_name()}_id": OuterRef('pk'),
+        f"{field.m2m_reverse_field_name()}_id__in": ids,
+    })))
+
+
+def _name_match_ids(lookup_model, term):
+    """
+    Ids of the cached lookup rows whose name contains *term*, so a search
+    can test the FK column instead of JOINing and LIKE-scanning the table.
+    """
+    term = term.casefold()
+    return [o['id'] for o in lookup_model.options() if term in o['name'].casefold()]
+
+
+def _price_range_q(params):
+    """
+    The ``min_price``/``max_price`` bounds parsed once into one filter
+    (empty ``Q`` when neither is a number – the common unfiltered case).
+    """
+    q = Q()
+    min_price = params.get('min_price')
+    if min_price and min_price.isdecimal():
+        q &= Q(minimal_tuition_fee__gte=int(min_price))
+    max_price = params.get('max_price')
+    if max_price and max_price.isdecimal():
+        q &= Q(maximal_tuition_fee__lte=int(max_price))
+    return q
+
+
+def _m2m_names(model, m2m_field, owner_ids):
+    """
+    ``{owner_id: [name, ...]}`` for one M2M of a page of rows: a single
+    through-table read with the names taken from the lookup's cached options
+    (kept in their name order, as the prefetch used to return them).
+    """
+    field = model._meta.get_field(m2m_field)
+    options = field.related_model.options()
+    rank = {o['id']: i for i, o in enumerate(options)}
+    result = {pk: [] for pk in owner_ids}
+    pairs = field.remote_field.through.objects.filter(**{
+        f"{field.m2m_field_name()}_id__in": owner_ids,
+    }).values_list(f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id")
+    for owner_id, target_id in pairs:
+        if target_id in rank:
+            result[owner_id].append(rank[target_id])
+    return {pk: [options[i]['name'] for i in sorted(ranks)] for pk, ranks in result.items()}
+
+
+def _file_url(model, field_name, name):
+    return model._meta.get_field(field_name).storage.url(name) if name else None
+
+
+UNIVERSITY_API_FIELDS = (
+    'id', 'full_name', 'slug', 'logo', 'description_preview',
+    'location__name', 'institution_category__name',
+    'minimal_tuition_fee', 'maximal_tuition_fee', 'is_open_for_admission',
+    'has_grant', 'has_accomodation', 'admission_start_date', 'admission_deadline', 'web_site',
+)
+DIRECTION_API_FIELDS = (
+    'id', 'direction_name', 'direction_slug', 'university__full_name', 'university__logo',
+    'category__name', 'description_preview', 'has_stipend', 'is_open_for_admission',
+    'application_deadline',
+)
+
+
+UZ_MONTHS = (
+    "Yanvar", "Fevral", "Mart", "Aprel", "May", "Iyun",
+    "Iyul", "Avgust", "Sentabr", "Oktabr", "Noyabr", "Dekabr",
+)
+
+
+EN_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _api_date(d):
+    """``05 June 2025`` (what ``strftime('%d %B %Y')`` gave, minus the locale lookup) or None."""
+    return f"{d.day:02d} {EN_MONTHS[d.month - 1]} {d.year}" if d else None
+
+
+@lru_cache(maxsize=512)   # dates are hashable and admission periods repeat
+def _uzbek_date(d):
+    """Return `1 Iyun 2025` style or '' if d is None."""
+    return f"{d.day} {UZ_MONTHS[d.month - 1]} {d.year}" if d else ""
+
+
+COUNT_CACHE_VERSION_KEY = 'qcount_version'  # bumped by web/apps.py on writes
+COUNT_CACHE_TIMEOUT = 300
+
+
+def _with_cached_count(queryset, fields=None):
+    """
+    Copy of *queryset* (as ``values(*fields)`` rows if given) whose ``count()``
+    (what Paginator calls) is memoized in the cache per compiled SQL – the
+    COUNT over the filtered query is usually the slowest statement of a list
+    page. On a miss it counts a ``pk``-only projection taken before *fields*,
+    so no selected column, annotation or joined table ends up in the COUNT.
+    """
+    qs = queryset.values(*fields) if fields else queryset._chain()
+    real_count = queryset.values('pk').count
+
+    def count(self):
+        try:
+            sql = str(qs.query)
+        except EmptyResultSet:   # .none() / an empty __in – nothing to count
+            return 0
+        version = cache.get_or_set(COUNT_CACHE_VERSION_KEY, 0, None)
+        digest = hashlib.md5(sql.encode(), usedforsecurity=False).hexdigest()
+        key = f"qcount:{version}:{digest}"
+        value = cache.get(key)
+        if value is None:
+            value = real_count()
+            cache.set(key, value, COUNT_CACHE_TIMEOUT)
+        return value
+
+    qs.count = count.__get__(qs)   # bound – Paginator only calls no-arg *methods*
+    return qs
+
+
+def _pagination_data(paginator, page_obj):
+    """The filter APIs' ``pagination`` block – each count/neighbour check done once."""
+    number, num_pages = page_obj.number, paginator.num_pages   # num_pages reads the (cached) count
+    has_previous, has_next = number > 1, number < num_pages
+    return {
+        'current_page': number,
+        'total_pages': num_pages,
+        'total_count': paginator.count,
+        'has_previous': has_previous,
+        'has_next': has_next,
+        'previous_page': number - 1 if has_previous else None,
+        'next_page': number + 1 if has_next else None,
+    }
+
+
+def filter_universities(queryset, params):
+    """
+    *queryset* narrowed and ordered by the university list's GET *params* –
+    shared by UniversityListView and university_filter_api.
+    """
+    # Filter by institution category - support for multiple values
+    institution_categories = params.getlist('institution_category')
+    if institution_categories:
+        ids = _institution_category_ids(institution_categories)
+        # names that match no category leave nothing to show
+        queryset = queryset.filter(institution_category_id__in=ids) if ids else queryset.none()
+    
+    # Filter by location - support for multiple values
+    locations = params.getlist('location')
+    if locations:
+        ids = _int_ids(locations)
+        if ids:
+            queryset = queryset.filter(location_id__in=ids)
+    
+    # Filter by education type - support for multiple values
+    education_types = params.getlist('education_type')
+    if education_types:
+        queryset = queryset.filter(_m2m_ids_q(University, 'education_types', education_types))
+    
+    # Filter by education language - support for multiple values
+    education_languages = params.getlist('education_language')
+    if education_languages:
+        queryset = queryset.filter(_m2m_ids_q(University, 'education_languages', education_languages))
+    
+    # Filter by degree - support for multiple values
+    degrees = params.getlist('degree')
+    if degrees:
+        queryset = queryset.filter(_m2m_ids_q(University, 'degrees', degrees))
+    
+    # Filter by price range
+    price_q = _price_range_q(params)
+    if price_q:
+        queryset = queryset.filter(price_q)
+    
+    # Filter by admission status
+    admission_status = params.get('admission_status')
+    if admission_status == 'open':
+        queryset = queryset.filter(is_open_for_admission=True)
+    
+    # Filter by search query with full-text search simulation
+    search_query = params.get('search')
+    if search_query:
+        search_terms = search_query.split()
+        search_q = Q()
+        for term in search_terms:
+            search_q |= (
+                Q(full_name__icontains=term) | 
+                Q(description__icontains=term) |
+                Q(location_id__in=_name_match_ids(Location, term)) |
+                Q(institution_category_id__in=_name_match_ids(InstitutionCategory, term))
+            )
+        queryset = queryset.filter(search_q)
+    
+    # Add sorting options
+    sort_by = params.get('sort', 'name')
+    if sort_by == 'name':
+        queryset = queryset.order_by('full_name')
+    elif sort_by == 'price_low':
+        queryset = queryset.order_by('minimal_tuition_fee')
+    elif sort_by == 'price_high':
+        queryset = queryset.order_by('-minimal_tuition_fee')
+    elif sort_by == 'location':
+        queryset = queryset.order_by('location__name', 'full_name')
+    else:
+        queryset = queryset.order_by('full_name')
+    
+    return queryset
+
+
+def filter_directions(queryset, params):
+    """
+    *queryset* narrowed and ordered by the direction list's GET *params* –
+    shared by DirectionListView and direction_filter_api.
+    """
+    # Filter by university
+    universities = params.getlist('university')
+    if universities:
+        ids = _int_ids(universities)
+        if ids:
+            queryset = queryset.filter(university_id__in=ids)
+    
+    # Filter by category
+    categories = params.getlist('category')
+    if categories:
+        ids = _int_ids(categories)
+        if ids:
+            queryset = queryset.filter(category_id__in=ids)
+    
+    # Filter by education type
+    education_types = params.getlist('education_type')
+    if education_types:
+        queryset = queryset.filter(_m2m_ids_q(Direction, 'education_types', education_types))
+    
+    # Filter by education language
+    education_languages = params.getlist('education_language')
+    if education_languages:
+        queryset = queryset.filter(_m2m_ids_q(Direction, 'education_languages', education_languages))
+    
+    # Filter by degree
+    degrees = params.getlist('degree')
+    if degrees:
+        queryset = queryset.filter(_m2m_ids_q(Direction, 'degrees', degrees))
+    
+    # Filter by admission status
+    admission_status = params.get('admission_status')
+    if admission_status == 'open':
+        queryset = queryset.filter(is_open_for_admission=True)
+    
+    # Filter by search query
+    search_query = params.get('search')
+    if search_query:
+        search_terms = search_query.split()
+        search_q = Q()
+        for term in search_terms:
+            search_q |= (
+                Q(direction_name__icontains=term) | 
+                Q(direction_description__icontains=term) |
+                Q(university__full_name__icontains=term) |
+                Q(category_id__in=_name_match_ids(Category, term))
+            )
+        queryset = queryset.filter(search_q)
+    
+    queryset = queryset.order_by('university__full_name', 'direction_name')
+    
+    return queryset
+
+
+HOME_STATS_CACHE_KEY = 'home_stats'
+HOME_STATS_TIMEOUT = 600
+FEATURED_CACHE_KEY = 'home_featured_ids'
+FEATURED_TIMEOUT = 60 * 60 * 24
+FEATURED_COUNT = 6
+
+
+def _pick_featured_ids():
+    """Random sample of the open universities' ids (the index-only id list, not the rows)."""
+    ids = list(University.objects.filter(is_open_for_admission=True).values_list('id', flat=True))
+    return random.sample(ids, min(FEATURED_COUNT, len(ids)))
+
+
+@cache_page(60 * 5)  # Cache for 5 minutes, like the university list
 def home_view(request):
     """Home page view that displays featured universities."""
-    # Get 6 universities that are open for admission
-    featured_universities = University.objects.filter(
-        is_open_for_admission=True
-    )[:6]  # Mix of promoted and random
+    # Get 6 universities that are open for admission – a random pick that is
+    # drawn from the ids once a day, never an ORDER BY RANDOM() over the table
+    # (list-card columns only, like the university list)
+    featured_ids = cache.get_or_set(FEATURED_CACHE_KEY, _pick_featured_ids, FEATURED_TIMEOUT)
+    featured_universities = University.objects.for_list().select_related(
+        'institution_category', 'location'
+    ).filter(
+        id__in=featured_ids, is_open_for_admission=True
+    )
     
-    # Counts for stats section
-    university_count = University.objects.count()
-    direction_count = Direction.objects.count()
-    location_count = Location.objects.count()
+    # Counts for stats section (cached; cleared by web/apps.py on writes)
+    stats = cache.get_or_set(HOME_STATS_CACHE_KEY, lambda: {
+        'university_count': University.objects.count(),
+        'direction_count': Direction.objects.count(),
+        'location_count': Location.objects.count(),
+    }, HOME_STATS_TIMEOUT)
     
     context = {
         'featured_universities': featured_universities,
-        'university_count': university_count,
-        'direction_count': direction_count,
-        'location_count': location_count,
+        **stats,
     }
     
     return render(request, 'universities/home.html', context)
@@ -48,112 +383,21 @@ class UniversityListView(ListView):
     
     def get_queryset(self):
         # Optimize with select_related and prefetch_related
-        queryset = University.objects.select_related(
-            'institution_category', 'location'
-        ).prefetch_related(
-            'education_types', 'education_languages', 'degrees', 'directions'
-        )
-        
-        # Apply filters if present in GET parameters
-        # Filter by institution category - support for multiple values
-        institution_categories = self.request.GET.getlist('institution_category')
-        if institution_categories:
-            category_query = Q()
-            for category in institution_categories:
-                # Handle both ID-based and value-based filtering (xususiy, davlat, xalqaro)
-                if category.isdigit():
-                    category_query |= Q(institution_category_id=category)
-                else:
-                    category_query |= Q(institution_category__name__icontains=category)
-            queryset = queryset.filter(category_query)
-        
-        # Filter by location - support for multiple values
-        locations = self.request.GET.getlist('location')
-        if locations:
-            location_query = Q()
-            for location_id in locations:
-                if location_id.isdigit():
-                    location_query |= Q(location_id=location_id)
-            queryset = queryset.filter(location_query)
-        
-        # Filter by education type - support for multiple values
-        education_types = self.request.GET.getlist('education_type')
-        if education_types:
-            education_type_query = Q()
-            for edu_type_id in education_types:
-                if edu_type_id.isdigit():
-                    education_type_query |= Q(education_types__id=edu_type_id)
-            queryset = queryset.filter(education_type_query)
-        
-        # Filter by education language - support for multiple values
-        education_languages = self.request.GET.getlist('education_language')
-        if education_languages:
-            education_language_query = Q()
-            for language_id in education_languages:
-                if language_id.isdigit():
-                    education_language_query |= Q(education_languages__id=language_id)
-            queryset = queryset.filter(education_language_query)
-        
-        # Filter by degree - support for multiple values
-        degrees = self.request.GET.getlist('degree')
-        if degrees:
-            degree_query = Q()
-            for degree_id in degrees:
-                if degree_id.isdigit():
-                    degree_query |= Q(degrees__id=degree_id)
-            queryset = queryset.filter(degree_query)
-        
-        # Filter by price range
-        min_price = self.request.GET.get('min_price')
-        max_price = self.request.GET.get('max_price')
-        if min_price and min_price.isdigit():
-            queryset = queryset.filter(minimal_tuition_fee__gte=int(min_price))
-        if max_price and max_price.isdigit():
-            queryset = queryset.filter(maximal_tuition_fee__lte=int(max_price))
+        queryset = University.objects.for_list().with_related()
         
-        # Filter by admission status
-        admission_status = self.request.GET.get('admission_status')
-        if admission_status == 'open':
-            queryset = queryset.filter(is_open_for_admission=True)
-        
-        # Filter by search query with full-text search simulation
-        search_query = self.request.GET.get('search')
-        if search_query:
-            search_terms = search_query.split()
-            search_q = Q()
-            for term in search_terms:
-                search_q |= (
-                    Q(full_name__icontains=term) | 
-                    Q(description__icontains=term) |
-                    Q(location__name__icontains=term) |
-                    Q(institution_category__name__icontains=term)
-                )
-            queryset = queryset.filter(search_q)
-        
-        # Add sorting options
-        sort_by = self.request.GET.get('sort', 'name')
-        if sort_by == 'name':
-            queryset = queryset.order_by('full_name')
-        elif sort_by == 'price_low':
-            queryset = queryset.order_by('minimal_tuition_fee')
-        elif sort_by == 'price_high':
-            queryset = queryset.order_by('-minimal_tuition_fee')
-        elif sort_by == 'location':
-            queryset = queryset.order_by('location__name', 'full_name')
-        else:
-            queryset = queryset.order_by('full_name')
-            
-        return queryset.distinct()
+        # Apply filters and sorting from the GET parameters
+        queryset = filter_universities(queryset, self.request.GET)
+        return _with_cached_count(queryset)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
         # Add filter options to context
-        context['institution_categories'] = InstitutionCategory.objects.all()
-        context['locations'] = Location.objects.all()
-        context['education_types'] = EducationType.objects.all()
-        context['education_languages'] = EducationLanguage.objects.all()
-        context['degrees'] = Degree.objects.all()
+        context['institution_categories'] = InstitutionCategory.options()
+        context['locations'] = Location.options()
+        context['education_types'] = EducationType.options()
+        context['education_languages'] = EducationLanguage.options()
+        context['degrees'] = Degree.options()
         
         # Keep selected filters in context as lists for multiple selection support
         context['selected_filters'] = {
@@ -179,74 +423,21 @@ class DirectionListView(ListView):
     paginate_by = 10
     
     def get_queryset(self):
-        queryset = Direction.objects.all()
-        
-        # Apply filters if present in GET parameters
-        # Filter by university - support for multiple values
-        universities = self.request.GET.getlist('university')
-        if universities:
-            university_query = Q()
-            for uni_id in universities:
-                university_query |= Q(university_id=uni_id)
-            queryset = queryset.filter(university_query)
-        
-        # Filter by category - support for multiple values
-        categories = self.request.GET.getlist('category')
-        if categories:
-            category_query = Q()
-            for category_id in categories:
-                category_query |= Q(category_id=category_id)
-            queryset = queryset.filter(category_query)
+        queryset = Direction.objects.for_list()
         
-        # Filter by education type - support for multiple values
-        education_types = self.request.GET.getlist('education_type')
-        if education_types:
-            education_type_query = Q()
-            for edu_type_id in education_types:
-                education_type_query |= Q(education_types__id=edu_type_id)
-            queryset = queryset.filter(education_type_query)
-        
-        # Filter by education language - support for multiple values
-        education_languages = self.request.GET.getlist('education_language')
-        if education_languages:
-            education_language_query = Q()
-            for language_id in education_languages:
-                education_language_query |= Q(education_languages__id=language_id)
-            queryset = queryset.filter(education_language_query)
-        
-        # Filter by degree - support for multiple values
-        degrees = self.request.GET.getlist('degree')
-        if degrees:
-            degree_query = Q()
-            for degree_id in degrees:
-                degree_query |= Q(degrees__id=degree_id)
-            queryset = queryset.filter(degree_query)
-        
-        # Filter by admission status
-        admission_status = self.request.GET.get('admission_status')
-        if admission_status == 'open':
-            queryset = queryset.filter(is_open_for_admission=True)
-        
-        # Filter by search query
-        search_query = self.request.GET.get('search')
-        if search_query:
-            queryset = queryset.filter(
-                Q(direction_name__icontains=search_query) | 
-                Q(direction_description__icontains=search_query) |
-                Q(university__full_name__icontains=search_query)
-            )
-            
-        return queryset.distinct()
+        # Apply filters from the GET parameters
+        queryset = filter_directions(queryset, self.request.GET)
+        return _with_cached_count(queryset)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
         # Add filter options to context
-        context['universities'] = University.objects.all()
-        context['categories'] = Category.objects.all()
-        context['education_types'] = EducationType.objects.all()
-        context['education_languages'] = EducationLanguage.objects.all()
-        context['degrees'] = Degree.objects.all()
+        context['universities'] = get_filter_options('directions')['universities']
+        context['categories'] = Category.options()
+        context['education_types'] = EducationType.options()
+        context['education_languages'] = EducationLanguage.options()
+        context['degrees'] = Degree.options()
         
         # Keep selected filters in context as lists for multiple selection support
         context['selected_filters'] = {
@@ -268,32 +459,27 @@ class UniversityDetailView(DetailView):
     template_name = "universities/university_detail.html"
     context_object_name = "university"
 
-    # --- helper -------------------------------------------------------------
-
-    @staticmethod
-    def _uzbek_date(d):
-        """Return `1 Iyun 2025` style or '' if d is None."""
-        if not d:
-            return ""
-        month = {
-            1: "Yanvar", 2: "Fevral", 3: "Mart",    4: "Aprel",
-            5: "May",    6: "Iyun",   7: "Iyul",    8: "Avgust",
-            9: "Sentabr",10: "Oktabr",11: "Noyabr",12: "Dekabr",
-        }[d.month]
-        return f"{d.day} {month} {d.year}"
-
     # --- view ---------------------------------------------------------------
 
+    def get_queryset(self):
+        # the programs list comes along with the university: one query for the
+        # directions (the parent is already at hand – join only the category)
+        # and one for their degrees
+        return University.objects.select_related(
+            'institution_category', 'location'
+        ).prefetch_related(
+            Prefetch(
+                'directions',
+                queryset=Direction.objects.select_related(None).select_related('category')
+                .order_by('direction_name').prefetch_related('degrees'),
+            ),
+        )
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
 
         # ❶ Directions/programs
-        directions = (
-            Direction.objects
-            .filter(university=self.object)
-            .order_by("direction_name")
-            .prefetch_related("degrees")
-        )
+        directions = self.object.directions.all()
         ctx["directions"] = directions
 
         # Group directions by degree
@@ -303,31 +489,18 @@ class UniversityDetailView(DetailView):
             
             # If no degrees assigned, put in 'other'
             if not degrees:
-                if 'other' not in degree_groups:
-                    degree_groups['other'] = []
-                degree_groups['other'].append(direction)
+                degree_groups.setdefault('other', []).append(direction)
                 continue
                 
             # Otherwise, add to each matching degree group
             for degree in degrees:
-                degree_key = degree.name.lower()
-                # Normalize degree keys for common types
-                if 'bakal' in degree_key:
-                    degree_key = 'bachelor'
-                elif 'magis' in degree_key:
-                    degree_key = 'master'
-                else:
-                    degree_key = 'other'
-                    
-                if degree_key not in degree_groups:
-                    degree_groups[degree_key] = []
-                degree_groups[degree_key].append(direction)
+                degree_groups.setdefault(degree.degree_key, []).append(direction)
         
         ctx["degrees"] = degree_groups
 
         # ❷ Admission period in Uzbek
-        start = self._uzbek_date(self.object.admission_start_date)
-        end   = self._uzbek_date(self.object.admission_deadline)
+        start = _uzbek_date(self.object.admission_start_date)
+        end   = _uzbek_date(self.object.admission_deadline)
 
         if start and end:
             ctx["admission_period"] = f"{start} – {end}"
@@ -347,13 +520,13 @@ class UniversityDetailView(DetailView):
         else:
             ctx["tuition_fee_range"] = "Ma'lumot mavjud emas"
             
+        referer = self.request.META.get("HTTP_REFERER")
+        current_url = self.request.build_absolute_uri()
         ctx["back_url"] = (
-            self.request.META.get("HTTP_REFERER") 
-            if self.request.META.get("HTTP_REFERER") != self.request.build_absolute_uri() 
-            and self.request.META.get("HTTP_REFERER") 
+            referer if referer and referer != current_url
             else reverse("universities:university_list")
         )
-        ctx["share_url"] = self.request.build_absolute_uri()
+        ctx["share_url"] = current_url
 
         return ctx
 
@@ -368,152 +541,73 @@ def university_filter_api(request):
     """
     try:
         # Get the same queryset as UniversityListView
-        queryset = University.objects.select_related(
-            'institution_category', 'location'
-        ).prefetch_related(
-            'education_types', 'education_languages', 'degrees', 'directions'
+        # (rich-text blobs stay in the DB – only a preview is serialized)
+        # (plain rows via values() – the payload needs no model instances)
+        queryset = University.objects.annotate(
+            description_preview=Left('description', 201)
         )
         
         # Apply the same filters as in UniversityListView
-        # Filter by institution category
-        institution_categories = request.GET.getlist('institution_category')
-        if institution_categories:
-            category_query = Q()
-            for category in institution_categories:
-                if category.isdigit():
-                    category_query |= Q(institution_category_id=category)
-                else:
-                    category_query |= Q(institution_category__name__icontains=category)
-            queryset = queryset.filter(category_query)
-        
-        # Filter by location
-        locations = request.GET.getlist('location')
-        if locations:
-            location_query = Q()
-            for location_id in locations:
-                if location_id.isdigit():
-                    location_query |= Q(location_id=location_id)
-            queryset = queryset.filter(location_query)
-        
-        # Filter by education type
-        education_types = request.GET.getlist('education_type')
-        if education_types:
-            education_type_query = Q()
-            for edu_type_id in education_types:
-                if edu_type_id.isdigit():
-                    education_type_query |= Q(education_types__id=edu_type_id)
-            queryset = queryset.filter(education_type_query)
-        
-        # Filter by education language
-        education_languages = request.GET.getlist('education_language')
-        if education_languages:
-            education_language_query = Q()
-            for language_id in education_languages:
-                if language_id.isdigit():
-                    education_language_query |= Q(education_languages__id=language_id)
-            queryset = queryset.filter(education_language_query)
-        
-        # Filter by degree
-        degrees = request.GET.getlist('degree')
-        if degrees:
-            degree_query = Q()
-            for degree_id in degrees:
-                if degree_id.isdigit():
-                    degree_query |= Q(degrees__id=degree_id)
-            queryset = queryset.filter(degree_query)
-        
-        # Filter by price range
-        min_price = request.GET.get('min_price')
-        max_price = request.GET.get('max_price')
-        if min_price and min_price.isdigit():
-            queryset = queryset.filter(minimal_tuition_fee__gte=int(min_price))
-        if max_price and max_price.isdigit():
-            queryset = queryset.filter(maximal_tuition_fee__lte=int(max_price))
-        
-        # Filter by admission status
-        admission_status = request.GET.get('admission_status')
-        if admission_status == 'open':
-            queryset = queryset.filter(is_open_for_admission=True)
-        
-        # Filter by search query
-        search_query = request.GET.get('search')
-        if search_query:
-            search_terms = search_query.split()
-            search_q = Q()
-            for term in search_terms:
-                search_q |= (
-                    Q(full_name__icontains=term) | 
-                    Q(description__icontains=term) |
-                    Q(location__name__icontains=term) |
-                    Q(institution_category__name__icontains=term)
-                )
-            queryset = queryset.filter(search_q)
-        
-        # Add sorting
-        sort_by = request.GET.get('sort', 'name')
-        if sort_by == 'name':
-            queryset = queryset.order_by('full_name')
-        elif sort_by == 'price_low':
-            queryset = queryset.order_by('minimal_tuition_fee')
-        elif sort_by == 'price_high':
-            queryset = queryset.order_by('-minimal_tuition_fee')
-        elif sort_by == 'location':
-            queryset = queryset.order_by('location__name', 'full_name')
-        else:
-            queryset = queryset.order_by('full_name')
-        
-        queryset = queryset.distinct()
+        queryset = filter_universities(queryset, request.GET)
         
         # Pagination
         page_number = request.GET.get('page', 1)
-        paginator = Paginator(queryset, 12) # Same as UniversityListView
+        paginator = Paginator(_with_cached_count(queryset, UNIVERSITY_API_FIELDS), 12) # Same as UniversityListView
         page_obj = paginator.page(page_number)
+        page_rows = list(page_obj)
+        directions_counts = dict(
+            Direction.objects.filter(university_id__in=[row['id'] for row in page_rows])
+            .values_list('university_id').annotate(n=Count('id')).order_by()
+        )
         
         # Serialize universities
         universities_data = []
-        for university in page_obj:
+        for university in page_rows:
+            preview = university['description_preview']
             university_data = {
-                'id': university.id,
-                'full_name': university.full_name,
-                'slug': university.slug,
-                'logo_url': university.logo.url if university.logo else None,
-                'description': university.description[:200] + '...' if university.description and len(university.description) > 200 else university.description,
-                'location': university.location.name if university.location else None,
-                'institution_category': university.institution_category.name if university.institution_category else None,
-                'minimal_tuition_fee': university.minimal_tuition_fee,
-                'maximal_tuition_fee': university.maximal_tuition_fee,
-                'is_open_for_admission': university.is_open_for_admission,
-                'has_grant': university.has_grant,
-                'has_accomodation': university.has_accomodation,
-                'admission_start_date': university.admission_start_date.strftime('%d %B %Y') if university.admission_start_date else None,
-                'admission_deadline': university.admission_deadline.strftime('%d %B %Y') if university.admission_deadline else None,
-                'directions_count': university.directions.count(),
-                'detail_url': reverse('universities:university_detail', kwargs={'slug': university.slug}),
-                'website': university.web_site,
+                'id': university['id'],
+                'full_name': university['full_name'],
+                'slug': university['slug'],
+                'logo_url': _file_url(University, 'logo', university['logo']),
+                'description': preview[:200] + '...' if preview and len(preview) > 200 else preview,
+                'location': university['location__name'],
+                'institution_category': university['institution_category__name'],
+                'minimal_tuition_fee': university['minimal_tuition_fee'],
+                'maximal_tuition_fee': university['maximal_tuition_fee'],
+                'is_open_for_admission': university['is_open_for_admission'],
+                'has_grant': university['has_grant'],
+                'has_accomodation': university['has_accomodation'],
+                'admission_start_date': _api_date(university['admission_start_date']),
+                'admission_deadline': _api_date(university['admission_deadline']),
+                'directions_count': directions_counts.get(university['id'], 0),
+                'detail_url': reverse('universities:university_detail', kwargs={'slug': university['slug']}),
+                'website': university['web_site'],
             }
             universities_data.append(university_data)
         
         # Response data
         response_data = {
             'universities': universities_data,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None,
-                'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
-            },
+            'pagination': _pagination_data(paginator, page_obj),
             'filters': {
-                'total_active': len([v for values in request.GET.lists() for v in values if v and v != request.GET.get('page', '')]),
+                'total_active': sum(1 for key, values in request.GET.lists() if key != 'page' for value in values if value),
             },
             'success': True
         }
         
         return JsonResponse(response_data)
         
-    except Exception as e:
+    except InvalidPage as e:
+        # a bad ?page= is the client's mistake – nothing to log
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+        
+    except DatabaseError as e:
+        # failed queries are logged – anything else is a bug and goes
+        # through Django's 500 handling (and its error logging)
+        logger.exception("%s failed", request.path)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -528,131 +622,174 @@ def direction_filter_api(request):
     """
     try:
         # Get the same queryset as DirectionListView
-        queryset = Direction.objects.select_related(
-            'university', 'category'
-        ).prefetch_related(
-            'education_types', 'education_languages', 'degrees', 'tuition_fees'
+        # (rich-text blobs stay in the DB – only a preview is serialized)
+        # (plain rows via values() – the payload needs no model instances)
+        queryset = Direction.objects.annotate(
+            description_preview=Left('direction_description', 151)
         )
         
-        # Apply filters similar to DirectionListView
-        # Filter by university
-        universities = request.GET.getlist('university')
-        if universities:
-            university_query = Q()
-            for uni_id in universities:
-                if uni_id.isdigit():
-                    university_query |= Q(university_id=uni_id)
-            queryset = queryset.filter(university_query)
-        
-        # Filter by category
-        categories = request.GET.getlist('category')
-        if categories:
-            category_query = Q()
-            for category_id in categories:
-                if category_id.isdigit():
-                    category_query |= Q(category_id=category_id)
-            queryset = queryset.filter(category_query)
-        
-        # Filter by education type
-        education_types = request.GET.getlist('education_type')
-        if education_types:
-            education_type_query = Q()
-            for edu_type_id in education_types:
-                if edu_type_id.isdigit():
-                    education_type_query |= Q(education_types__id=edu_type_id)
-            queryset = queryset.filter(education_type_query)
-        
-        # Filter by education language
-        education_languages = request.GET.getlist('education_language')
-        if education_languages:
-            education_language_query = Q()
-            for language_id in education_languages:
-                if language_id.isdigit():
-                    education_language_query |= Q(education_languages__id=language_id)
-            queryset = queryset.filter(education_language_query)
-        
-        # Filter by degree
-        degrees = request.GET.getlist('degree')
-        if degrees:
-            degree_query = Q()
-            for degree_id in degrees:
-                if degree_id.isdigit():
-                    degree_query |= Q(degrees__id=degree_id)
-            queryset = queryset.filter(degree_query)
-        
-        # Filter by admission status
-        admission_status = request.GET.get('admission_status')
-        if admission_status == 'open':
-            queryset = queryset.filter(is_open_for_admission=True)
-        
-        # Filter by search query
-        search_query = request.GET.get('search')
-        if search_query:
-            search_terms = search_query.split()
-            search_q = Q()
-            for term in search_terms:
-                search_q |= (
-                    Q(direction_name__icontains=term) | 
-                    Q(direction_description__icontains=term) |
-                    Q(university__full_name__icontains=term) |
-                    Q(category__name__icontains=term)
-                )
-            queryset = queryset.filter(search_q)
-        
-        queryset = queryset.distinct().order_by('university__full_name', 'direction_name')
+        # Apply the same filters as in DirectionListView
+        queryset = filter_directions(queryset, request.GET)
         
         # Pagination
         page_number = request.GET.get('page', 1)
-        paginator = Paginator(queryset, 10) # Same as DirectionListView
+        paginator = Paginator(_with_cached_count(queryset, DIRECTION_API_FIELDS), 10) # Same as DirectionListView
         page_obj = paginator.page(page_number)
+        page_rows = list(page_obj)
+        page_ids = [row['id'] for row in page_rows]
+        degrees = _m2m_names(Direction, 'degrees', page_ids)
+        languages = _m2m_names(Direction, 'education_languages', page_ids)
+        edu_types = _m2m_names(Direction, 'education_types', page_ids)
+        first_fees = {}
+        for direction_id, fee in (TuitionFee.objects.filter(direction_id__in=page_ids)
+                                  .order_by('direction_id', 'local_tuition_fee')
+                                  .values_list('direction_id', 'local_tuition_fee')):
+            first_fees.setdefault(direction_id, fee)
         
         # Serialize directions
         directions_data = []
-        for direction in page_obj:
-            first_fee = direction.tuition_fees.first()
+        for direction in page_rows:
+            preview = direction['description_preview']
             direction_data = {
-                'id': direction.id,
-                'direction_name': direction.direction_name,
-                'direction_slug': direction.direction_slug,
-                'university_name': direction.university.full_name,
-                'university_logo': direction.university.logo.url if direction.university.logo else None,
-                'category': direction.category.name if direction.category else None,
-                'description': direction.direction_description[:150] + '...' if direction.direction_description and len(direction.direction_description) > 150 else direction.direction_description,
-                'has_stipend': direction.has_stipend,
-                'is_open_for_admission': direction.is_open_for_admission,
-                'application_deadline': direction.application_deadline.strftime('%d %B %Y') if direction.application_deadline else None,
-                'tuition_fee': first_fee.local_tuition_fee if first_fee else None,
-                'degrees': [degree.name for degree in direction.degrees.all()],
-                'education_languages': [lang.name for lang in direction.education_languages.all()],
-                'education_types': [edu_type.name for edu_type in direction.education_types.all()],
-                'detail_url': reverse('universities:direction_detail', kwargs={'direction_slug': direction.direction_slug}),
+                'id': direction['id'],
+                'direction_name': direction['direction_name'],
+                'direction_slug': direction['direction_slug'],
+                'university_name': direction['university__full_name'],
+                'university_logo': _file_url(University, 'logo', direction['university__logo']),
+                'category': direction['category__name'],
+                'description': preview[:150] + '...' if preview and len(preview) > 150 else preview,
+                'has_stipend': direction['has_stipend'],
+                'is_open_for_admission': direction['is_open_for_admission'],
+                'application_deadline': _api_date(direction['application_deadline']),
+                'tuition_fee': first_fees.get(direction['id']),
+                'degrees': degrees[direction['id']],
+                'education_languages': languages[direction['id']],
+                'education_types': edu_types[direction['id']],
+                'detail_url': reverse('universities:direction_detail', kwargs={'direction_slug': direction['direction_slug']}),
             }
             directions_data.append(direction_data)
         
         # Response data
         response_data = {
             'directions': directions_data,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None,
-                'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
-            },
+            'pagination': _pagination_data(paginator, page_obj),
             'success': True
         }
         
         return JsonResponse(response_data)
         
-    except Exception as e:
+    except InvalidPage as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+        
+    except DatabaseError as e:
+        logger.exception("%s failed", request.path)
         return JsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
 
 
+# One cached option set per list page (bump a suffix when its payload shape changes);
+# web/apps.py clears only the sets a model's writes affect
+FILTER_OPTIONS_CACHE_KEYS = {
+    'universities': 'filter_options_universities_v1',
+    'directions': 'filter_options_directions_v1',
+}
+FILTER_OPTIONS_TIMEOUT = 3600
+PRICE_BOUNDS_CACHE_KEY = 'univ_price_bounds'
+PRICE_BOUNDS_TIMEOUT = 600
+
+
+def _price_bounds():
+    """
+    ``{'min', 'max'}`` tuition bounds for the price slider – one MIN/MAX
+    aggregate, cached on its own so only University writes (web/apps.py)
+    recompute it when the rest of the filter options are rebuilt.
+    """
+    def aggregate():
+        price_stats = University.objects.aggregate(
+            min_price=Min('minimal_tuition_fee'),
+            max_price=Max('maximal_tuition_fee')
+        )
+        return {
+            'min': price_stats['min_price'] or 0,
+            'max': price_stats['max_price'] or 100000000
+        }
+    return cache.get_or_set(PRICE_BOUNDS_CACHE_KEY, aggregate, PRICE_BOUNDS_TIMEOUT)
+
+
+def _build_university_filter_options():
+    """
+    The university list's option lists as plain data (safe to pickle into the cache).
+    """
+    return {
+        'institution_categories': list(InstitutionCategory.options()),
+        'locations': list(
+            Location.objects.annotate(
+                university_count=Count('university')
+            ).order_by('name').values('id', 'name', 'university_count').iterator(chunk_size=500)
+        ),
+        'education_types': list(EducationType.options()),
+        'education_languages': list(EducationLanguage.options()),
+        'degrees': list(Degree.options()),
+    }
+
+
+def _build_direction_filter_options():
+    """
+    The direction list's option lists as plain data (safe to pickle into the cache).
+    """
+    return {
+        'categories': list(
+            Category.objects.annotate(
+                direction_count=Count('direction')
+            ).order_by('name').values('id', 'name', 'direction_count').iterator(chunk_size=500)
+        ),
+        'universities': list(
+            University.objects.with_directions_count().order_by('full_name').values(
+                'id', name=F('full_name'), direction_count=F('directions_count'),
+            ).iterator(chunk_size=500)
+        ),
+    }
+
+
+FILTER_OPTIONS_BUILDERS = {
+    'universities': _build_university_filter_options,
+    'directions': _build_direction_filter_options,
+}
+
+
+def get_filter_options(kind):
+    """The cached ``'universities'`` or ``'directions'`` option set, rebuilt on a miss."""
+    return cache.get_or_set(
+        FILTER_OPTIONS_CACHE_KEYS[kind], FILTER_OPTIONS_BUILDERS[kind], FILTER_OPTIONS_TIMEOUT
+    )
+
+
+# filter_options_api's encoded response body per ?type= (cleared with the sets by web/apps.py)
+FILTER_OPTIONS_TYPES = ('all', 'universities', 'directions')
+FILTER_OPTIONS_RESPONSE_CACHE_KEY = 'filter_options_response_v2:{}'
+FILTER_OPTIONS_RESPONSE_TIMEOUT = 300
+
+
+def _filter_options_data(filter_type):
+    # each option set (and the price aggregate) is only touched by the types that return it
+    data = {}
+    
+    if filter_type in ('all', 'universities'):
+        data.update(get_filter_options('universities'))
+        # Add price range statistics
+        data['price_range'] = _price_bounds()
+    
+    if filter_type in ('all', 'directions'):
+        data.update(get_filter_options('directions'))
+    
+    return data
+
+
 @require_http_methods(["GET"])
 def filter_options_api(request):
     """
@@ -662,67 +799,23 @@ def filter_options_api(request):
     try:
         filter_type = request.GET.get('type', 'all')
         
-        data = {}
-        
-        if filter_type in ['all', 'universities']:
-            data.update({
-                'institution_categories': [
-                    {'id': cat.id, 'name': cat.name} 
-                    for cat in InstitutionCategory.objects.all().order_by('name')
-                ],
-                'locations': [
-                    {'id': loc.id, 'name': loc.name, 'university_count': loc.university_set.count()} 
-                    for loc in Location.objects.annotate(
-                        university_count=Count('university')
-                    ).order_by('name')
-                ],
-                'education_types': [
-                    {'id': et.id, 'name': et.name} 
-                    for et in EducationType.objects.all().order_by('name')
-                ],
-                'education_languages': [
-                    {'id': el.id, 'name': el.name} 
-                    for el in EducationLanguage.objects.all().order_by('name')
-                ],
-                'degrees': [
-                    {'id': deg.id, 'name': deg.name} 
-                    for deg in Degree.objects.all().order_by('name')
-                ],
-            })
-        
-        if filter_type in ['all', 'directions']:
-            data.update({
-                'categories': [
-                    {'id': cat.id, 'name': cat.name, 'direction_count': cat.direction_set.count()} 
-                    for cat in Category.objects.annotate(
-                        direction_count=Count('direction')
-                    ).order_by('name')
-                ],
-                'universities': [
-                    {'id': uni.id, 'name': uni.full_name, 'direction_count': uni.directions.count()} 
-                    for uni in University.objects.annotate(
-                        direction_count=Count('directions')
-                    ).order_by('full_name')
-                ],
-            })
-        
-        # Add price range statistics
-        if filter_type in ['all', 'universities']:
-            price_stats = University.objects.aggregate(
-                min_price=Min('minimal_tuition_fee'),
-                max_price=Max('maximal_tuition_fee')
-            )
-            data['price_range'] = {
-                'min': price_stats['min_price'] or 0,
-                'max': price_stats['max_price'] or 100000000
-            }
+        if filter_type not in FILTER_OPTIONS_TYPES:
+            return JsonResponse({'success': True, 'data': {}})
+        
+        # the encoded body is cached, so a hit skips serialization entirely
+        body = cache.get_or_set(
+            FILTER_OPTIONS_RESPONSE_CACHE_KEY.format(filter_type),
+            lambda: json.dumps(
+                {'success': True, 'data': _filter_options_data(filter_type)},
+                separators=(',', ':'),
+            ),
+            FILTER_OPTIONS_RESPONSE_TIMEOUT,
+        )
         
-        return JsonResponse({
-            'success': True,
-            'data': data
-        })
+        return HttpResponse(body, content_type='application/json')
         
-    except Exception as e:
+    except DatabaseError as e:
+        logger.exception("%s failed", request.path)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -737,28 +830,22 @@ class DirectionDetailView(DetailView):
     slug_field = "direction_slug"
     slug_url_kwarg = "direction_slug"
     
-    # --- helper -------------------------------------------------------------
-    
-    @staticmethod
-    def _uzbek_date(d):
-        """Return `1 Iyun 2025` style or '' if d is None."""
-        if not d:
-            return ""
-        month = {
-            1: "Yanvar", 2: "Fevral", 3: "Mart",    4: "Aprel",
-            5: "May",    6: "Iyun",   7: "Iyul",    8: "Avgust",
-            9: "Sentabr",10: "Oktabr",11: "Noyabr",12: "Dekabr",
-        }[d.month]
-        return f"{d.day} {month} {d.year}"
-    
     # --- view ---------------------------------------------------------------
     
+    def get_queryset(self):
+        # the direction's own texts are the page; of the joined university only
+        # the header fields are shown, so its rich text and contacts stay behind
+        return Direction.objects.defer(
+            'education_type_bits', 'education_language_bits',
+            *DIRECTION_UNIVERSITY_DEFERRED,
+        )
+    
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         
         # ❶ Application period in Uzbek
-        start = self._uzbek_date(self.object.application_start_date)
-        end = self._uzbek_date(self.object.application_deadline)
+        start = _uzbek_date(self.object.application_start_date)
+        end = _uzbek_date(self.object.application_deadline)
         
         if start and end:
             ctx["application_period"] = f"{start} – {end}"
@@ -769,12 +856,12 @@ class DirectionDetailView(DetailView):
         else:
             ctx["application_period"] = "Ma'lumot yo'q"
             
+        referer = self.request.META.get("HTTP_REFERER")
+        current_url = self.request.build_absolute_uri()
         ctx["back_url"] = (
-            self.request.META.get("HTTP_REFERER") 
-            if self.request.META.get("HTTP_REFERER") != self.request.build_absolute_uri() 
-            and self.request.META.get("HTTP_REFERER") 
+            referer if referer and referer != current_url
             else reverse("universities:direction_list")
         )
-        ctx["share_url"] = self.request.build_absolute_uri()
+        ctx["share_url"] = current_url
         
         return ctx